@@ -0,0 +1,108 @@
+# animation_writer.py
+import struct
+import zlib
+import numpy as np
+
+# Cores (RGB) dos códigos da grade: vazio, coelho e raposa, as mesmas de
+# GRID_COLORS ('white', 'lightgreen', 'red')
+PALETTE = ((255, 255, 255), (144, 238, 144), (255, 0, 0))
+
+_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+
+def _chunk(kind, data):
+    """Monta um chunk PNG: tamanho, tipo, dados e CRC."""
+    return (struct.pack('>I', len(data)) + kind + data +
+            struct.pack('>I', zlib.crc32(kind + data) & 0xFFFFFFFF))
+
+
+class AnimationWriter:
+    """
+    Grava a grade da simulação como um único PNG animado (APNG), quadro a
+    quadro, à medida que a simulação anda. Cada quadro é uma imagem com
+    paleta (um byte por pixel, com os códigos 0 = vazio, 1 = coelho e
+    2 = raposa) comprimida com zlib e acrescentada ao fim do arquivo: não
+    há matplotlib, nem um arquivo por passo, nem varredura de diretório.
+
+    O número de quadros só é conhecido no fim; close o grava no cabeçalho
+    (chunk acTL). O arquivo só é criado no primeiro quadro.
+    """
+
+    def __init__(self, path, scale=1, fps=10, compression=6):
+        """
+        Cria um gravador.
+        :param path: O arquivo a gravar (.png)
+        :param scale: Quantos pixels, em cada direção, cada célula ocupa
+        :param fps: Quadros por segundo na reprodução
+        :param compression: O nível de compressão do zlib (0 a 9)
+        """
+        self.path = path
+        self.scale = max(1, scale)
+        self.fps = fps
+        self.compression = compression
+        self.frames = 0
+        self._file = None
+        self._shape = None
+        self._actl_offset = None
+        self._sequence = 0  # Número de sequência dos chunks fcTL e fdAT
+
+    def add_frame(self, grid):
+        """
+        Acrescenta um quadro.
+        :param grid: Um array 2D com os códigos da grade; todos os quadros
+                     devem ter o tamanho do primeiro
+        """
+        grid = np.asarray(grid, dtype=np.uint8)
+        if self.scale > 1:
+            grid = grid.repeat(self.scale, axis=0).repeat(self.scale, axis=1)
+        if self._file is None:
+            self._open(grid.shape)
+        elif grid.shape != self._shape:
+            raise ValueError(f"Quadro {grid.shape[0]}×{grid.shape[1]} em uma animação "
+                             f"{self._shape[0]}×{self._shape[1]}")
+
+        height, width = grid.shape
+        self._file.write(_chunk(b'fcTL', struct.pack(
+            '>IIIIIHHBB', self._next_sequence(), width, height, 0, 0, 1, self.fps, 0, 0)))
+
+        # Cada linha começa com o byte de filtro (0 = nenhum)
+        rows = np.zeros((height, width + 1), dtype=np.uint8)
+        rows[:, 1:] = grid
+        data = zlib.compress(rows.tobytes(), self.compression)
+        if self.frames == 0:
+            self._file.write(_chunk(b'IDAT', data))
+        else:
+            self._file.write(_chunk(b'fdAT', struct.pack('>I', self._next_sequence()) + data))
+        self.frames += 1
+
+    def close(self):
+        """Termina o arquivo e grava nele o número de quadros."""
+        if self._file is None:
+            return
+        self._file.write(_chunk(b'IEND', b''))
+        self._file.seek(self._actl_offset)
+        self._file.write(self._actl())
+        self._file.close()
+        self._file = None
+
+    def _open(self, shape):
+        """Cria o arquivo e grava os cabeçalhos."""
+        height, width = shape
+        self._shape = shape
+        self._file = open(self.path, 'wb')
+        self._file.write(_SIGNATURE)
+        # Profundidade de 8 bits, tipo de cor 3 (paleta)
+        self._file.write(_chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 3, 0, 0, 0)))
+        self._file.write(_chunk(b'PLTE', bytes(value for color in PALETTE for value in color)))
+        self._actl_offset = self._file.tell()
+        self._file.write(self._actl())
+
+    def _actl(self):
+        """O chunk acTL com o número atual de quadros (repetição infinita)."""
+        return _chunk(b'acTL', struct.pack('>II', self.frames, 0))
+
+    def _next_sequence(self):
+        """Retorna o próximo número de sequência."""
+        sequence = self._sequence
+        self._sequence += 1
+        return sequence
@@ -0,0 +1,232 @@
+# array_field.py
+import numpy as np
+from grid import Grid, downsample
+from rabbit import Rabbit
+from fox import Fox
+from field_stats import FieldStats
+from zobrist import Zobrist
+
+class ArrayField(Grid):
+    """
+    Uma implementação alternativa de Field que guarda o estado dos animais
+    em arrays NumPy contíguos (estrutura de arrays), indexados pela célula
+    (row * width + col). Cada célula ocupa apenas alguns bytes: o código da
+    espécie, a idade e o nível de comida.
+
+    Oferece a mesma interface de Field (place_rabbit, place_fox,
+    get_object_at, get_free_adjacent_cells, ...), aceitando células ou
+    Locations, de modo que o Simulator pode usá-la no lugar de Field.
+    """
+
+    # A classe de animal de cada código guardado no array species
+    CLASSES = {Grid.RABBIT: Rabbit, Grid.FOX: Fox}
+
+    def __init__(self, depth, width):
+        """
+        Representa um campo com as dimensões dadas.
+        """
+        super().__init__(depth, width)
+        size = depth * width
+        self.species = np.zeros(size, dtype=np.int8)
+        self.age = np.zeros(size, dtype=np.int16)
+        self.food = np.zeros(size, dtype=np.int16)
+        # Objetos Rabbit/Fox já entregues ou recebidos neste campo, por
+        # célula. Mantém a identidade dos animais durante um passo (uma
+        # raposa que come um coelho precisa matar o mesmo objeto que foi
+        # movido para o próximo estado do campo).
+        self._animals = {}
+        self.stats = FieldStats()  # Contagens mantidas a cada mudança
+
+    def place_rabbit(self, rabbit, location):
+        """
+        Coloca um coelho na localização dada.
+        Se já houver um animal na localização, ele será perdido.
+        """
+        assert location is not None
+        cell = self._cell(location)
+        self._discard(cell)
+        self.species[cell] = self.RABBIT
+        self.age[cell] = rabbit.age
+        self.food[cell] = 0
+        self._animals[cell] = rabbit
+        self.stats.increment_count(Rabbit)
+        rabbit.field = self
+        rabbit.cell = cell
+
+    def place_fox(self, fox, location):
+        """
+        Coloca uma raposa na localização dada.
+        Se já houver um animal na localização, ele será perdido.
+        """
+        assert location is not None
+        cell = self._cell(location)
+        self._discard(cell)
+        self.species[cell] = self.FOX
+        self.age[cell] = fox.age
+        self.food[cell] = fox.food_level
+        self._animals[cell] = fox
+        self.stats.increment_count(Fox)
+        fox.field = self
+        fox.cell = cell
+
+    def notify_death(self, animal):
+        """
+        Avisa o campo de que um animal seu morreu; a célula dele é esvaziada.
+        """
+        cell = animal.cell
+        if self._animals.get(cell) is animal:
+            self.stats.decrement_count(self.CLASSES[self.species[cell]])
+            self.species[cell] = self.EMPTY
+            del self._animals[cell]
+
+    def get_object_at(self, location):
+        """
+        Retorna o animal na localização dada, se houver.
+        """
+        return self._animal_at(self._cell(location))
+
+    def get_free_adjacent_cells(self, cell):
+        """
+        Obtém uma lista embaralhada das células adjacentes livres.
+        """
+        return [next_cell for next_cell in self.get_adjacent_cells(cell)
+                if self._is_free(next_cell)]
+
+    def clear(self):
+        """
+        Esvazia o campo. Só o array de espécies é zerado: a idade e o
+        nível de comida de células vazias nunca são lidos.
+        """
+        self.species.fill(self.EMPTY)
+        self._animals.clear()
+        self.stats.reset()
+        self.stats.count_finished()
+
+    def refresh_stats(self):
+        """
+        Recalcula as contagens a partir dos arrays. Necessário depois de
+        escrever diretamente nos arrays (como faz o VectorizedStepper).
+        """
+        for code, animal_class in self.CLASSES.items():
+            count = int(np.count_nonzero(self.species == code))
+            self.stats.set_count(animal_class, count)
+        self.stats.count_finished()
+
+    def snapshot(self, rows=None, cols=None):
+        """
+        Retorna uma cópia da grade como um array (depth, width) de int8 com
+        os códigos EMPTY, RABBIT e FOX.
+        :param rows: Se dado, só as primeiras rows linhas
+        :param cols: Se dado, só as primeiras cols colunas
+        """
+        return self.species.reshape(self.depth, self.width)[:rows, :cols].copy()
+
+    def downsampled_snapshot(self, rows, cols):
+        """
+        Retorna a grade inteira reduzida para caber em rows × cols: cada
+        posição representa um bloco de células e guarda o maior código do
+        bloco (ver downsample).
+        """
+        grid = downsample(self.species.reshape(self.depth, self.width), rows, cols)
+        return grid.copy() if grid.base is not None else grid
+
+    def export_population(self):
+        """
+        Retorna os animais vivos como arrays, na ordem das células (a
+        ordem em que agirão no próximo passo).
+        :return: Um dicionário com rabbit_cells, rabbit_age, fox_cells,
+                 fox_age e fox_food
+        """
+        rabbit_cells = np.flatnonzero(self.species == self.RABBIT)
+        fox_cells = np.flatnonzero(self.species == self.FOX)
+        return {
+            'rabbit_cells': rabbit_cells,
+            'rabbit_age': self.age[rabbit_cells],
+            'fox_cells': fox_cells,
+            'fox_age': self.age[fox_cells],
+            'fox_food': self.food[fox_cells]
+        }
+
+    def import_population(self, rabbit_cells, rabbit_age, fox_cells, fox_age, fox_food):
+        """
+        Substitui o conteúdo do campo pelos animais dados (no formato de
+        export_population), escrevendo direto nos arrays.
+        """
+        self.clear()
+        self.species[rabbit_cells] = self.RABBIT
+        self.age[rabbit_cells] = rabbit_age
+        self.food[rabbit_cells] = 0
+        self.species[fox_cells] = self.FOX
+        self.age[fox_cells] = fox_age
+        self.food[fox_cells] = fox_food
+        self.refresh_stats()
+
+    def get_state_hash(self):
+        """
+        Retorna o hash de Zobrist do conteúdo do campo (ver Zobrist), o
+        mesmo que um Field com os mesmos animais daria. Como o
+        VectorizedStepper escreve direto nos arrays, o hash é calculado a
+        partir deles a cada chamada, e não mantido incrementalmente.
+        """
+        cells = np.flatnonzero(self.species)
+        species = self.species[cells]
+        food = np.where(species == self.FOX, self.food[cells], 0)
+        return Zobrist.hash_cells(cells, Zobrist.state_codes(species, self.age[cells], food))
+
+    def is_viable(self):
+        """
+        Retorna se há pelo menos um coelho e uma raposa no campo.
+        """
+        return self.stats.get_count(Rabbit) > 0 and self.stats.get_count(Fox) > 0
+
+    def get_rabbits(self):
+        """Retorna uma lista dos coelhos que estão vivos."""
+        return self._get_alive(self.RABBIT)
+
+    def get_foxes(self):
+        """Retorna uma lista das raposas que estão vivas."""
+        return self._get_alive(self.FOX)
+
+    def _animal_at(self, cell):
+        """
+        Retorna o animal da célula, materializando um objeto Rabbit ou Fox
+        a partir dos arrays na primeira vez em que ele é pedido.
+        """
+        code = self.species[cell]
+        if code == self.EMPTY:
+            return None
+
+        animal = self._animals.get(cell)
+        if animal is None:
+            if code == self.RABBIT:
+                animal = Rabbit(False, cell)
+            else:
+                animal = Fox(False, cell, int(self.food[cell]))
+            animal.age = int(self.age[cell])
+            animal.field = self
+            self._animals[cell] = animal
+        return animal
+
+    def _is_free(self, cell):
+        """Uma célula está livre se estiver vazia ou com um animal morto."""
+        if self.species[cell] == self.EMPTY:
+            return True
+        animal = self._animals.get(cell)
+        return animal is not None and not animal.is_alive()
+
+    def _discard(self, cell):
+        """
+        Retira das contagens o animal vivo que ocupa a célula, se houver
+        (ele será sobrescrito).
+        """
+        if not self._is_free(cell):
+            self.stats.decrement_count(self.CLASSES[self.species[cell]])
+
+    def _get_alive(self, code):
+        """Retorna os animais vivos de uma espécie, na ordem das células."""
+        animals = []
+        for cell in np.flatnonzero(self.species == code).tolist():
+            animal = self._animal_at(cell)
+            if animal.is_alive():
+                animals.append(animal)
+        return animals
@@ -0,0 +1,275 @@
+# benchmark.py
+import argparse
+import json
+import multiprocessing as mp
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from parameters import SimulationParameters
+from randomizer import Randomizer
+from simulator import Simulator, MODES
+from rabbit import Rabbit
+from fox import Fox
+
+# Densidades iniciais (FOX_CREATION_PROBABILITY, RABBIT_CREATION_PROBABILITY)
+DENSITIES = {
+    'default': (0.2, 0.08),
+    'sparse': (0.02, 0.08)
+}
+
+
+# Quantas vezes cada caso é executado; o tempo gravado é a mediana
+DEFAULT_REPEATS = 5
+
+
+def _cases(modes, sizes, densities, seeds, steps, repeats=DEFAULT_REPEATS):
+    """Monta a lista de casos de todas as combinações dadas."""
+    return [{'name': f"{mode}-{depth}x{width}-{density}-s{seed}",
+             'mode': mode, 'depth': depth, 'width': width,
+             'density': density, 'seed': seed, 'steps': steps, 'repeats': repeats}
+            for mode in modes
+            for depth, width in sizes
+            for density in densities
+            for seed in seeds]
+
+
+# Os conjuntos de casos disponíveis. Os tamanhos e densidades foram
+# escolhidos para que as duas espécies sobrevivam a todos os passos: um
+# caso extinto mede uma grade vazia. O modo classic (objetos Python) fica
+# limitado a grades em que um passo ainda leva menos de um segundo.
+# Referência, com um núcleo: vectorized-2000x2000 faz cerca de 10 passos/s
+# na densidade default e 1,2 passo/s na sparse (2,3 milhões de animais
+# atualizados por segundo nas duas); passos de dezenas de ms nessas
+# grades exigiriam kernels compilados
+SUITES = {
+    'quick': (_cases(['classic', 'array', 'vectorized'], [(80, 120)], ['default'], [1111], 30) +
+              _cases(['vectorized'], [(500, 500)], ['default'], [1111], 20)),
+    'full': (_cases(['classic', 'array'], [(120, 180), (200, 300)], list(DENSITIES), [1111, 2222], 100) +
+             _cases(['vectorized'], [(120, 180), (200, 300), (1000, 1000), (2000, 2000)],
+                    list(DENSITIES), [1111, 2222], 50))
+}
+
+# Quanto um resultado pode piorar em relação à linha de base (fração)
+DEFAULT_THRESHOLD = 0.2
+
+
+# Tempo máximo, em segundos, para importar o simulator e criar um
+# Simulator sem visualização em um interpretador novo
+STARTUP_BUDGET = 0.5
+
+# Módulos que não devem ser carregados por uma execução sem visualização
+HEAVY_MODULES = ('matplotlib', 'IPython')
+
+# Executado em um interpretador novo por measure_startup
+_STARTUP_SCRIPT = f"""
+import json, sys, time
+start = time.perf_counter()
+from simulator import Simulator
+imported = time.perf_counter()
+Simulator(40, 60, headless=True)
+created = time.perf_counter()
+print(json.dumps({{'import_seconds': imported - start,
+                  'setup_seconds': created - imported,
+                  'heavy_modules': [name for name in {HEAVY_MODULES!r} if name in sys.modules]}}))
+"""
+
+
+def measure_startup(repeats=5):
+    """
+    Mede o custo de partida de uma execução curta: importar o simulator e
+    criar um Simulator sem visualização, cada vez em um interpretador novo.
+    :return: Um dicionário com a mediana de import_seconds, setup_seconds
+             e total_seconds, e os módulos pesados (HEAVY_MODULES) que
+             foram carregados
+    """
+    directory = os.path.dirname(os.path.abspath(__file__))
+    runs = []
+    for _ in range(repeats):
+        output = subprocess.run([sys.executable, '-c', _STARTUP_SCRIPT], cwd=directory,
+                                capture_output=True, text=True, check=True).stdout
+        runs.append(json.loads(output.splitlines()[-1]))
+    result = {key: statistics.median(run[key] for run in runs)
+              for key in ('import_seconds', 'setup_seconds')}
+    result['total_seconds'] = result['import_seconds'] + result['setup_seconds']
+    result['heavy_modules'] = sorted({name for run in runs for name in run['heavy_modules']})
+    return result
+
+
+def check_startup(budget=STARTUP_BUDGET):
+    """
+    Mede a partida e a compara com o orçamento.
+    :return: Uma lista de mensagens, uma por problema
+    """
+    result = measure_startup()
+    print(f"{'startup':40s} import {result['import_seconds']:.3f} s | "
+          f"Simulator {result['setup_seconds']:.3f} s | total {result['total_seconds']:.3f} s")
+    problems = []
+    if result['total_seconds'] > budget:
+        problems.append(f"partida: {result['total_seconds']:.3f} s (orçamento {budget:.3f} s)")
+    if result['heavy_modules']:
+        problems.append(f"partida: carregou {', '.join(result['heavy_modules'])}")
+    return problems
+
+
+def _run_once(case):
+    """
+    Executa um caso uma vez.
+    :return: A tupla (passos executados, animais atualizados, segundos)
+    """
+    Randomizer.SEED = case['seed']
+    Randomizer.reset()
+    simulator = Simulator(case['depth'], case['width'], headless=True,
+                          **MODES[case['mode']])
+
+    steps = 0
+    updates = 0
+    start = time.perf_counter()
+    for _ in range(case['steps']):
+        if not simulator.field.is_viable():
+            break
+        stats = simulator.field.stats
+        updates += stats.get_count(Rabbit) + stats.get_count(Fox)
+        simulator.simulate_one_step()
+        steps += 1
+    seconds = time.perf_counter() - start
+    simulator.close()
+    return steps, updates, seconds
+
+
+def run_case(case):
+    """
+    Executa um caso sem visualização nem pausa, case['repeats'] vezes com
+    a mesma semente, e mede o desempenho pela mediana dos tempos.
+    Deve rodar em um processo novo, para que o pico de memória medido seja
+    só o dele.
+    :return: O caso, acrescido de steps, seconds, steps_per_second,
+             animal_updates_per_second e peak_rss_mb
+    """
+    fox_probability, rabbit_probability = DENSITIES[case['density']]
+    parameters = SimulationParameters({
+        'Simulator.FOX_CREATION_PROBABILITY': fox_probability,
+        'Simulator.RABBIT_CREATION_PROBABILITY': rabbit_probability
+    })
+    parameters.apply()
+    try:
+        runs = [_run_once(case) for _ in range(case.get('repeats', 1))]
+    finally:
+        parameters.restore()
+
+    # Com a mesma semente, só o tempo muda de uma execução para outra
+    steps, updates, _ = runs[0]
+    seconds = statistics.median(run[2] for run in runs)
+    result = dict(case)
+    result['steps_run'] = steps
+    result['seconds'] = seconds
+    result['steps_per_second'] = steps / seconds if seconds > 0 else 0.0
+    result['animal_updates_per_second'] = updates / seconds if seconds > 0 else 0.0
+    # ru_maxrss é dado em kilobytes no Linux
+    result['peak_rss_mb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return result
+
+
+def run_suite(cases):
+    """
+    Executa os casos, um de cada vez, cada um em um processo novo.
+    :return: A lista de resultados (ver run_case)
+    """
+    context = mp.get_context('spawn')
+    results = []
+    for case in cases:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            result = executor.submit(run_case, case).result()
+        print(f"{result['name']:40s} {result['steps_per_second']:9.2f} steps/s "
+              f"{result['animal_updates_per_second']:12.0f} animais/s "
+              f"{result['peak_rss_mb']:8.1f} MB")
+        if result['steps_run'] < result['steps']:
+            print(f"⚠️ {result['name']}: extinção no passo {result['steps_run']} "
+                  f"de {result['steps']}; o tempo medido não é confiável")
+        results.append(result)
+    return results
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Compara resultados com uma linha de base. Um caso regride se ficar
+    mais lento (steps_per_second) ou usar mais memória (peak_rss_mb) do
+    que a linha de base além da tolerância. Um caso que executou outro
+    número de passos que a linha de base também é apontado: os tempos
+    não são comparáveis.
+    :param baseline: Os resultados da linha de base
+    :param threshold: A tolerância, como fração (0.2 = 20%)
+    :return: Uma lista de mensagens, uma por regressão
+    """
+    reference = {result['name']: result for result in baseline}
+    regressions = []
+    for result in results:
+        base = reference.get(result['name'])
+        if base is None:
+            continue
+        if result['steps_run'] != base.get('steps_run'):
+            regressions.append(f"{result['name']}: {result['steps_run']} passos executados "
+                               f"(linha de base {base.get('steps_run')})")
+            continue
+        if result['steps_per_second'] < base['steps_per_second'] * (1 - threshold):
+            regressions.append(f"{result['name']}: {result['steps_per_second']:.2f} steps/s "
+                               f"(linha de base {base['steps_per_second']:.2f})")
+        if result['peak_rss_mb'] > base['peak_rss_mb'] * (1 + threshold):
+            regressions.append(f"{result['name']}: {result['peak_rss_mb']:.1f} MB "
+                               f"(linha de base {base['peak_rss_mb']:.1f})")
+    return regressions
+
+
+def load_results(path):
+    """Lê resultados gravados com save_results."""
+    with open(path) as file:
+        return json.load(file)['results']
+
+
+def save_results(results, path):
+    """Grava resultados em JSON, para servir de linha de base."""
+    with open(path, 'w') as file:
+        json.dump({'python': sys.version.split()[0], 'results': results}, file, indent=2)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mede a velocidade e a memória da simulação.")
+    parser.add_argument('--suite', choices=sorted(SUITES), default='quick')
+    parser.add_argument('--baseline', help="JSON com os resultados de referência")
+    parser.add_argument('--save', help="grava os resultados neste JSON")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="piora tolerada, como fração (padrão 0.2)")
+    parser.add_argument('--startup', action='store_true',
+                        help="mede só o tempo de partida, contra --startup-budget")
+    parser.add_argument('--startup-budget', type=float, default=STARTUP_BUDGET,
+                        help=f"tempo de partida máximo, em segundos (padrão {STARTUP_BUDGET})")
+    args = parser.parse_args(argv)
+
+    if args.startup:
+        problems = check_startup(args.startup_budget)
+        for message in problems:
+            print(f"❌ Regressão: {message}")
+        if problems:
+            return 1
+        print("✅ Partida dentro do orçamento")
+        return 0
+
+    results = run_suite(SUITES[args.suite])
+    if args.save:
+        save_results(results, args.save)
+
+    if args.baseline:
+        regressions = compare(results, load_results(args.baseline), args.threshold)
+        for message in regressions:
+            print(f"❌ Regressão: {message}")
+        if regressions:
+            return 1
+        print("✅ Nenhuma regressão em relação à linha de base")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+# chunked_field.py
+import numpy as np
+from field import Field
+from rabbit import Rabbit
+
+# Lado (em células) de cada bloco quadrado do ChunkedField
+CHUNK_SIZE = 64
+
+
+class ChunkedCells:
+    """
+    Mapeamento célula → animal dividido em blocos de CHUNK_SIZE × CHUNK_SIZE
+    células. Um bloco só existe enquanto tem algum animal: é criado no
+    primeiro animal colocado nele e liberado quando o último sai.
+
+    Oferece as operações de dicionário que o Field usa (get, atribuição,
+    del, clear e len).
+    """
+
+    def __init__(self, width, chunk_size=CHUNK_SIZE):
+        """
+        Cria um mapeamento vazio.
+        :param width: A largura da grade
+        :param chunk_size: O lado de cada bloco, em células
+        """
+        self.width = width
+        self.chunk_size = chunk_size
+        self.chunks = {}  # Blocos ocupados: (linha, coluna) do bloco → {célula: animal}
+        self._size = 0
+
+    def chunk_of(self, cell):
+        """Retorna a chave (linha, coluna) do bloco que contém a célula."""
+        row, col = divmod(cell, self.width)
+        return row // self.chunk_size, col // self.chunk_size
+
+    def get(self, cell, default=None):
+        """Retorna o animal na célula, ou default se ela estiver vazia."""
+        chunk = self.chunks.get(self.chunk_of(cell))
+        if chunk is None:
+            return default
+        return chunk.get(cell, default)
+
+    def __setitem__(self, cell, animal):
+        key = self.chunk_of(cell)
+        chunk = self.chunks.get(key)
+        if chunk is None:
+            chunk = {}
+            self.chunks[key] = chunk
+        if cell not in chunk:
+            self._size += 1
+        chunk[cell] = animal
+
+    def __delitem__(self, cell):
+        key = self.chunk_of(cell)
+        chunk = self.chunks[key]
+        del chunk[cell]
+        self._size -= 1
+        if not chunk:
+            del self.chunks[key]
+
+    def __contains__(self, cell):
+        chunk = self.chunks.get(self.chunk_of(cell))
+        return chunk is not None and cell in chunk
+
+    def __len__(self):
+        return self._size
+
+    def clear(self):
+        """Remove todos os animais e libera todos os blocos."""
+        self.chunks.clear()
+        self._size = 0
+
+
+class ChunkedField(Field):
+    """
+    Um Field para mundos enormes e pouco povoados. Os animais ficam em
+    blocos de CHUNK_SIZE × CHUNK_SIZE células (ChunkedCells) e só os blocos
+    com animais ocupam memória.
+
+    Nada depende da área: os passos percorrem os registros de animais, as
+    contagens e a verificação de DEBUG percorrem só os blocos ocupados, e
+    snapshot de uma região visita só os blocos que a cruzam. Custo e
+    memória crescem com a população, não com depth × width.
+    """
+
+    # Vizinhança calculada sob demanda (SparseNeighborIndex)
+    SPARSE_NEIGHBORS = True
+
+    def __init__(self, depth, width, chunk_size=CHUNK_SIZE):
+        """
+        Representa um campo com as dimensões dadas.
+        :param chunk_size: O lado de cada bloco, em células
+        """
+        super().__init__(depth, width)
+        self.field = ChunkedCells(width, chunk_size)
+
+    def get_chunk_count(self):
+        """Retorna quantos blocos estão ocupados (alocados)."""
+        return len(self.field.chunks)
+
+    def chunk_populations(self):
+        """
+        Retorna as contagens de cada bloco ocupado.
+        :return: Um dicionário {(linha, coluna) do bloco: (coelhos, raposas)}
+        """
+        populations = {}
+        for key, chunk in self.field.chunks.items():
+            rabbits = sum(1 for animal in chunk.values() if isinstance(animal, Rabbit))
+            populations[key] = (rabbits, len(chunk) - rabbits)
+        return populations
+
+    def iter_animals(self):
+        """Percorre os animais de todos os blocos ocupados."""
+        for chunk in self.field.chunks.values():
+            yield from chunk.values()
+
+    def snapshot(self, rows=None, cols=None):
+        """
+        Retorna o canto superior esquerdo da grade, com rows linhas e cols
+        colunas (por padrão, a grade toda), como um array de int8 com os
+        códigos EMPTY, RABBIT e FOX. Só os blocos ocupados que cruzam a
+        região são visitados. Para ver uma grade enorme inteira, use
+        downsampled_snapshot, que não cria um array do tamanho do campo.
+        """
+        rows = self.depth if rows is None else min(rows, self.depth)
+        cols = self.width if cols is None else min(cols, self.width)
+        size = self.field.chunk_size
+        grid = np.zeros((rows, cols), dtype=np.int8)
+        for (chunk_row, chunk_col), chunk in self.field.chunks.items():
+            if chunk_row * size >= rows or chunk_col * size >= cols:
+                continue
+            for cell, animal in chunk.items():
+                row, col = divmod(cell, self.width)
+                if row < rows and col < cols:
+                    grid[row, col] = self.RABBIT if isinstance(animal, Rabbit) else self.FOX
+        return grid
+
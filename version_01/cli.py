@@ -0,0 +1,227 @@
+# cli.py
+import argparse
+import ast
+import contextlib
+import json
+import sys
+import time
+from parameters import SimulationParameters
+from randomizer import Randomizer
+from simulator import Simulator, MODES
+from telemetry import TelemetrySink
+from observers import (SimulationObserver, ViewObserver, SteadyStateDetector,
+                       TerminalObserver, AnimationObserver, TelemetryObserver)
+from rabbit import Rabbit
+from fox import Fox
+
+# Códigos de saída (2 fica com o argparse, para argumentos inválidos)
+EXIT_COMPLETED = 0   # Todos os passos foram executados
+EXIT_ERROR = 1       # A execução falhou
+EXIT_EXTINCT = 3     # Uma das espécies (ou as duas) foi extinta antes do fim
+EXIT_STEADY = 4      # O SteadyStateDetector encerrou a execução
+
+
+class CountsObserver(SimulationObserver):
+    """
+    Guarda o que o resumo final precisa: os máximos de cada espécie e as
+    contagens do último passo, olhando todos os passos (a gravação das
+    contagens fica com um TelemetryObserver, que pode pular passos).
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.max_rabbits = 0
+        self.max_foxes = 0
+        self.last = None
+
+    def on_step(self, step, field):
+        rabbits = field.stats.get_count(Rabbit)
+        foxes = field.stats.get_count(Fox)
+        self.max_rabbits = max(self.max_rabbits, rabbits)
+        self.max_foxes = max(self.max_foxes, foxes)
+        self.last = (step, rabbits, foxes)
+
+
+def parse_parameter(text):
+    """
+    Lê um parâmetro no formato "Classe.CONSTANTE=valor"; o valor é lido
+    como literal Python (número, booleano...).
+    :return: A tupla (nome, valor)
+    """
+    name, separator, value = text.partition('=')
+    if not separator:
+        raise argparse.ArgumentTypeError(f"Parâmetro sem '=': {text}")
+    try:
+        return name.strip(), ast.literal_eval(value.strip())
+    except (ValueError, SyntaxError):
+        raise argparse.ArgumentTypeError(f"Valor inválido em {text}")
+
+
+def positive_int(text):
+    """Lê um inteiro maior que zero (para o type= do argparse)."""
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Não é um inteiro: {text}")
+    if value <= 0:
+        raise argparse.ArgumentTypeError(f"Deve ser maior que zero: {text}")
+    return value
+
+
+def build_parser():
+    """Monta o parser dos argumentos da linha de comando."""
+    parser = argparse.ArgumentParser(
+        description="Executa a simulação sem interação e grava as contagens de cada passo.",
+        epilog=f"Códigos de saída: {EXIT_COMPLETED} = concluída, {EXIT_EXTINCT} = extinção, "
+               f"{EXIT_STEADY} = estado estacionário, {EXIT_ERROR} = erro, 2 = argumentos inválidos.")
+    parser.add_argument('--depth', type=positive_int, default=Simulator.DEFAULT_DEPTH)
+    parser.add_argument('--width', type=positive_int, default=Simulator.DEFAULT_WIDTH)
+    parser.add_argument('--steps', type=positive_int, default=500, help="número máximo de passos")
+    parser.add_argument('--seed', type=int, default=Randomizer.SEED)
+    parser.add_argument('--mode', choices=sorted(MODES), default='classic',
+                        help="implementação do campo e dos passos (padrão classic)")
+    parser.add_argument('--processes', type=positive_int,
+                        help="divide os passos do modo vectorized em faixas, entre N processos")
+    parser.add_argument('--counter-based', action='store_true',
+                        help="sorteios por contador (ver CounterRandom)")
+    parser.add_argument('--param', type=parse_parameter, action='append', default=[],
+                        metavar='Classe.CONSTANTE=valor',
+                        help="muda uma constante, ex: Fox.BREEDING_PROBABILITY=0.1 (repetível)")
+    parser.add_argument('--output', help="arquivo das contagens por passo ('-' para a saída padrão)")
+    parser.add_argument('--format', choices=('jsonl', 'csv'),
+                        help="formato das contagens (padrão: pela extensão, senão jsonl)")
+    parser.add_argument('--stride', type=positive_int, default=1, help="grava as contagens a cada N passos")
+    parser.add_argument('--summary', help="arquivo JSON do resumo final (padrão: saída padrão, "
+                                          "ou a saída de erro se --output for '-')")
+    parser.add_argument('--render', choices=('none', 'view', 'terminal'), default='none',
+                        help="visualização durante a execução (padrão none)")
+    parser.add_argument('--animation', help="grava a grade em um PNG animado (ver AnimationWriter)")
+    parser.add_argument('--frame-size', type=positive_int, default=AnimationObserver.FRAME_ROWS,
+                        help="lado máximo dos quadros da animação, em células; grades maiores "
+                             "são reduzidas (padrão %(default)s)")
+    parser.add_argument('--stop-steady', action='store_true',
+                        help="encerra a execução em ciclo ou estado estacionário")
+    return parser
+
+
+def run(args):
+    """
+    Executa a simulação descrita pelos argumentos.
+    :return: A tupla (código de saída, resumo)
+    """
+    # Os parâmetros são validados antes de qualquer arquivo ser aberto
+    parameters = SimulationParameters(dict(args.param))
+    output_format = args.format
+    if output_format is None:
+        output_format = 'csv' if args.output and args.output.endswith('.csv') else 'jsonl'
+
+    counts = CountsObserver()
+    observers = [counts]
+    detector = None
+    if args.stop_steady:
+        detector = SteadyStateDetector()
+        observers.append(detector)
+    if args.render == 'terminal':
+        from terminal_renderer import TerminalRenderer
+        # A grade é reduzida pelo campo ao tamanho do terminal
+        observers.append(TerminalObserver(TerminalRenderer(sys.stderr)))
+    if args.animation:
+        from animation_writer import AnimationWriter
+        observers.append(AnimationObserver(AnimationWriter(args.animation),
+                                           rows=args.frame_size, cols=args.frame_size))
+
+    stream = None
+    parameters.apply()
+    try:
+        if args.output == '-':
+            stream = sys.stdout
+        elif args.output:
+            stream = open(args.output, 'w', newline='')
+        if stream is not None:
+            sink = TelemetrySink(stream, format=output_format)
+            observers.append(TelemetryObserver(sink, args.stride))
+
+        Randomizer.SEED = args.seed
+        Randomizer.set_counter_based(args.counter_based)
+        Randomizer.reset()
+
+        options = dict(MODES[args.mode])
+        if args.processes is not None:
+            options['processes'] = args.processes
+        # Tudo o que a simulação e a visualização imprimem vai para a saída
+        # de erro; a saída padrão fica só com as contagens e o resumo
+        with contextlib.redirect_stdout(sys.stderr):
+            if args.render == 'view':
+                from simulator_view import SimulatorView
+                observers.append(ViewObserver(SimulatorView(args.depth, args.width)))
+            simulator = Simulator(args.depth, args.width, headless=True,
+                                  observers=observers, **options)
+
+            start = time.perf_counter()
+            try:
+                simulator.simulate(args.steps)
+            finally:
+                seconds = time.perf_counter() - start
+                simulator.close()
+    finally:
+        parameters.restore()
+        if stream is not None and args.output != '-':
+            stream.close()
+
+    rabbits = simulator.field.stats.get_count(Rabbit)
+    foxes = simulator.field.stats.get_count(Fox)
+    if detector is not None and detector.should_stop():
+        outcome, code = 'steady', EXIT_STEADY
+    elif not simulator.field.is_viable():
+        outcome, code = 'extinct', EXIT_EXTINCT
+    else:
+        outcome, code = 'completed', EXIT_COMPLETED
+
+    summary = {
+        'outcome': outcome,
+        'exit_code': code,
+        'steps': simulator.step,
+        'requested_steps': args.steps,
+        'extinct': [name for name, count in (('rabbits', rabbits), ('foxes', foxes)) if count == 0],
+        'final_rabbits': rabbits,
+        'final_foxes': foxes,
+        'max_rabbits': counts.max_rabbits,
+        'max_foxes': counts.max_foxes,
+        'state_hash': simulator.field.get_state_hash(),
+        'seconds': seconds,
+        'steps_per_second': simulator.step / seconds if seconds > 0 else 0.0,
+        'seed': args.seed,
+        'depth': simulator.field.get_depth(),
+        'width': simulator.field.get_width(),
+        'mode': args.mode,
+        'parameters': parameters.values
+    }
+    if detector is not None and outcome == 'steady':
+        summary['steady_reason'] = detector.reason
+        summary['steady_period'] = detector.period
+    return code, summary
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.processes is not None and args.mode != 'vectorized':
+        parser.error("--processes só vale com --mode vectorized")
+    try:
+        code, summary = run(args)
+    except Exception as e:
+        print(json.dumps({'outcome': 'error', 'exit_code': EXIT_ERROR, 'error': str(e)}),
+              file=sys.stderr)
+        return EXIT_ERROR
+
+    text = json.dumps(summary)
+    if args.summary:
+        with open(args.summary, 'w') as file:
+            file.write(text + '\n')
+    else:
+        print(text, file=sys.stderr if args.output == '-' else sys.stdout)
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
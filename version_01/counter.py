@@ -27,6 +27,14 @@ class Counter:
         """Incrementa o contador atual em um."""
         self.count += 1
 
+    def decrement(self):
+        """Decrementa o contador atual em um."""
+        self.count -= 1
+
+    def set_count(self, count):
+        """Define o contador atual."""
+        self.count = count
+
     def reset(self):
         """Redefine o contador atual para zero."""
         self.count = 0
@@ -0,0 +1,110 @@
+# counter_random.py
+import numpy as np
+
+# Os valores são inteiros sem sinal de 64 bits
+MASK = (1 << 64) - 1
+_GOLDEN = 0x9E3779B97F4A7C15
+_MIX1 = 0xBF58476D1CE4E5B9
+_MIX2 = 0x94D049BB133111EB
+
+
+def mix64(x):
+    """
+    A função de mistura do SplitMix64 sobre um inteiro de 64 bits: pequenas
+    mudanças na entrada mudam toda a saída.
+    """
+    z = (x + _GOLDEN) & MASK
+    z = ((z ^ (z >> 30)) * _MIX1) & MASK
+    z = ((z ^ (z >> 27)) * _MIX2) & MASK
+    return z ^ (z >> 31)
+
+
+def mix64_array(x):
+    """mix64 aplicada a um array de uint64 (a multiplicação já dá a volta)."""
+    z = x + np.uint64(_GOLDEN)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(_MIX1)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(_MIX2)
+    return z ^ (z >> np.uint64(31))
+
+
+def stream_key(seed, step):
+    """Combina a semente e o passo na chave base dos sorteios do passo."""
+    return mix64(mix64(seed & MASK) ^ (step & MASK))
+
+
+def counter_hash(key, ids, stream):
+    """
+    Retorna um valor de 64 bits para cada id: depende só da chave, do id
+    e do número do fluxo (stream), nunca da ordem em que é pedido.
+    :param ids: Um array de inteiros não negativos (ex: células)
+    """
+    h = mix64_array(np.asarray(ids).astype(np.uint64) ^ np.uint64(key))
+    return mix64_array(h ^ np.uint64(stream & MASK))
+
+
+def counter_uniform(key, ids, stream):
+    """Um número em [0, 1) para cada id (53 bits, como random.random)."""
+    return (counter_hash(key, ids, stream) >> np.uint64(11)) * (1.0 / (1 << 53))
+
+
+def counter_integers(key, ids, stream, low, high):
+    """Um inteiro em [low, high) para cada id."""
+    values = np.floor(counter_uniform(key, ids, stream) * (high - low))
+    return low + values.astype(np.int64)
+
+
+class CounterRandom:
+    """
+    Um gerador com a interface usada pela simulação (random, randint e
+    shuffle) em que cada número é uma função da semente, do passo, de um
+    id (a célula de um animal) e de um contador: os sorteios de um animal
+    não dependem da ordem em que os animais agem nem de quantos processos
+    os calculam.
+
+    Antes de cada animal agir, o Simulator escolhe o fluxo com set_key(step,
+    célula); todos os sorteios seguintes (inclusive os do Field e dos
+    filhotes) saem desse fluxo.
+    """
+
+    def __init__(self, seed):
+        """Cria o gerador com a semente dada."""
+        self.seed(seed)
+
+    def seed(self, seed):
+        """Redefine a semente e volta ao fluxo inicial."""
+        self._seed = seed
+        self.set_key(0, 0)
+
+    def set_key(self, step, id):
+        """Passa a sortear do fluxo (step, id), a partir do início."""
+        self._step = step
+        self._id = id
+        self._base = mix64(stream_key(self._seed, step) ^ (id & MASK))
+        self._counter = 0
+
+    def random(self):
+        """Retorna o próximo número do fluxo, em [0, 1)."""
+        value = mix64(self._base ^ self._counter)
+        self._counter += 1
+        return (value >> 11) * (1.0 / (1 << 53))
+
+    def randint(self, a, b):
+        """Retorna um inteiro em [a, b], incluindo os dois extremos."""
+        return a + int(self.random() * (b - a + 1))
+
+    def shuffle(self, values):
+        """Embaralha a lista no lugar (Fisher-Yates)."""
+        for i in range(len(values) - 1, 0, -1):
+            j = int(self.random() * (i + 1))
+            values[i], values[j] = values[j], values[i]
+
+    def getstate(self):
+        """Retorna o estado (semente, passo, id, contador)."""
+        return (self._seed, self._step, self._id, self._counter)
+
+    def setstate(self, state):
+        """Restaura um estado obtido com getstate."""
+        seed, step, id, counter = state
+        self._seed = seed
+        self.set_key(step, id)
+        self._counter = counter
@@ -1,25 +1,33 @@
 # field.py
-from randomizer import Randomizer
+import numpy as np
+from grid import Grid
 from rabbit import Rabbit
 from fox import Fox
-from location import Location
+from population_registry import PopulationRegistry
+from field_stats import FieldStats
+from zobrist import Zobrist
 
-class Field:
+class Field(Grid):
     """
     Representa uma grade retangular de posições de campo.
     Cada posição é capaz de armazenar um único animal/objeto.
+
+    Internamente, as posições são células identificadas pelo índice plano
+    row * width + col. Os métodos aceitam tanto uma célula (int) quanto
+    uma Location; os métodos *_cells trabalham só com células e são os
+    usados pelos animais a cada passo.
     """
 
     def __init__(self, depth, width):
         """
         Representa um campo com as dimensões dadas.
         """
-        self.depth = depth
-        self.width = width
-        self.field = {}  # Animais mapeados por localização
-        self.rabbits = []  # Os dois tipos de animal
-        self.foxes = []
-        self._rand = Randomizer.get_random()
+        super().__init__(depth, width)
+        self.field = {}  # Animais mapeados por célula
+        self.rabbits = PopulationRegistry()  # Os dois tipos de animal
+        self.foxes = PopulationRegistry()
+        self.stats = FieldStats()  # Contagens mantidas a cada mudança
+        self.state_hash = 0  # Hash de Zobrist do conteúdo, mantido a cada mudança
 
     def place_rabbit(self, rabbit, location):
         """
@@ -27,15 +35,16 @@ class Field:
         Se já houver um animal na localização, ele será perdido.
         """
         assert location is not None
-        other = self.field.get(location)
-
-        if isinstance(other, Rabbit):
-            self.rabbits.remove(other)
-        elif isinstance(other, Fox):
-            self.foxes.remove(other)
+        cell = self._cell(location)
+        self._discard(self.field.get(cell))
 
-        self.field[location] = rabbit
-        self.rabbits.append(rabbit)
+        key = Zobrist.key(cell, Zobrist.state_code(self.RABBIT, rabbit.age, 0))
+        self.field[cell] = rabbit
+        self.rabbits.add(rabbit, key)
+        self.state_hash ^= key
+        self.stats.increment_count(Rabbit)
+        rabbit.field = self
+        rabbit.cell = cell
 
     def place_fox(self, fox, location):
         """
@@ -43,111 +52,161 @@ class Field:
         Se já houver um animal na localização, ele será perdido.
         """
         assert location is not None
-        other = self.field.get(location)
-
-        if isinstance(other, Rabbit):
-            self.rabbits.remove(other)
-        elif isinstance(other, Fox):
-            self.foxes.remove(other)
-
-        self.field[location] = fox
-        self.foxes.append(fox)
-
+        cell = self._cell(location)
+        self._discard(self.field.get(cell))
+
+        key = Zobrist.key(cell, Zobrist.state_code(self.FOX, fox.age, fox.food_level))
+        self.field[cell] = fox
+        self.foxes.add(fox, key)
+        self.state_hash ^= key
+        self.stats.increment_count(Fox)
+        fox.field = self
+        fox.cell = cell
+
+    def notify_death(self, animal):
+        """
+        Avisa o campo de que um animal seu morreu; ele é retirado da grade
+        e do registro de sua espécie.
+        """
+        if self.field.get(animal.cell) is animal:
+            del self.field[animal.cell]
+        self._discard(animal)
 
     def get_object_at(self, location):
         """
-        Retorna o animal na localização dada, se houver.
+        Retorna o animal na localização (ou célula) dada, se houver.
         """
-        return self.field.get(location)
+        return self.field.get(self._cell(location))
 
-    def get_free_adjacent_locations(self, location):
+    def get_free_adjacent_cells(self, cell):
         """
-        Obtém uma lista embaralhada das localizações adjacentes livres.
+        Obtém uma lista embaralhada das células adjacentes livres.
         """
         free = []
-        adjacent = self.get_adjacent_locations(location)
-
-        for next_location in adjacent:
-            animal = self.field.get(next_location)
-            if animal is None:
-                free.append(next_location)
-            else:
-                if isinstance(animal, Rabbit) and not animal.is_alive():
-                    free.append(next_location)
-                elif isinstance(animal, Fox) and not animal.is_alive():
-                    free.append(next_location)
-
+        for next_cell in self.get_adjacent_cells(cell):
+            animal = self.field.get(next_cell)
+            if animal is None or not animal.is_alive():
+                free.append(next_cell)
 
         return free
 
-
-    def get_adjacent_locations(self, location):
-        """
-        Retorna uma lista embaralhada de localizações adjacentes à dada.
-        A lista não incluirá a própria localização.
-        Todas as localizações estarão dentro da grade.
-        """
-        locations = []
-        if location is not None:
-            row = location.row
-            col = location.col
-
-            for roffset in range(-1, 2):
-                next_row = row + roffset
-                if 0 <= next_row < self.depth:
-                    for coffset in range(-1, 2):
-                        next_col = col + coffset
-                        # Exclui localizações inválidas e a localização original
-                        if (0 <= next_col < self.width and
-                            (roffset != 0 or coffset != 0)):
-                            locations.append(Location(next_row, next_col))
-
-            # Embaralha a lista. Vários outros métodos dependem da lista
-            # estar em ordem aleatória
-            self._rand.shuffle(locations) # Corrected line
-
-        return locations
-
-    def field_stats(self):
-        """Imprime o número de raposas e coelhos no campo."""
-        num_foxes = 0
-        num_rabbits = 0
-
-        for animal in self.field.values():
-            if isinstance(animal, Fox) and animal.is_alive():
-                num_foxes += 1
-            elif isinstance(animal, Rabbit) and animal.is_alive():
-                num_rabbits += 1
-
-        print(f"Rabbits: {num_rabbits} Foxes: {num_foxes}")
-
-
     def clear(self):
         """Esvazia o campo."""
         self.field.clear()
         self.rabbits.clear()
         self.foxes.clear()
+        self.stats.reset()
+        self.stats.count_finished()
+        self.state_hash = 0
+
+    def snapshot(self, rows=None, cols=None):
+        """
+        Retorna a grade como um array (depth, width) de int8 com os códigos
+        EMPTY, RABBIT e FOX. O custo é proporcional ao número de animais,
+        não ao de células.
+        :param rows: Se dado, só as primeiras rows linhas
+        :param cols: Se dado, só as primeiras cols colunas
+        """
+        rows = self.depth if rows is None else min(rows, self.depth)
+        cols = self.width if cols is None else min(cols, self.width)
+        grid = np.zeros((rows, cols), dtype=np.int8)
+        for cells, code in self._occupied_cells():
+            cell_rows, cell_cols = np.divmod(cells, self.width)
+            inside = (cell_rows < rows) & (cell_cols < cols)
+            grid[cell_rows[inside], cell_cols[inside]] = code
+        return grid
+
+    def downsampled_snapshot(self, rows, cols):
+        """
+        Retorna a grade inteira reduzida para caber em rows × cols: cada
+        posição representa um bloco de células (ver block_size) e guarda o
+        maior código do bloco. Nenhuma grade do tamanho do campo é criada;
+        o custo é proporcional ao número de animais.
+        """
+        block_rows, block_cols = self.block_size(rows, cols)
+        grid = np.zeros((-(-self.depth // block_rows), -(-self.width // block_cols)),
+                        dtype=np.int8)
+        # As raposas são escritas depois dos coelhos: o maior código vence
+        for cells, code in self._occupied_cells():
+            cell_rows, cell_cols = np.divmod(cells, self.width)
+            grid[cell_rows // block_rows, cell_cols // block_cols] = code
+        return grid
+
+    def export_population(self):
+        """
+        Retorna os animais vivos como arrays, na ordem dos registros (a
+        ordem em que agirão no próximo passo).
+        :return: Um dicionário com rabbit_cells, rabbit_age, fox_cells,
+                 fox_age e fox_food
+        """
+        rabbits = self.rabbits
+        foxes = self.foxes
+        return {
+            'rabbit_cells': np.fromiter((r.cell for r in rabbits), dtype=np.int64, count=len(rabbits)),
+            'rabbit_age': np.fromiter((r.age for r in rabbits), dtype=np.int16, count=len(rabbits)),
+            'fox_cells': np.fromiter((f.cell for f in foxes), dtype=np.int64, count=len(foxes)),
+            'fox_age': np.fromiter((f.age for f in foxes), dtype=np.int16, count=len(foxes)),
+            'fox_food': np.fromiter((f.food_level for f in foxes), dtype=np.int16, count=len(foxes))
+        }
+
+    def import_population(self, rabbit_cells, rabbit_age, fox_cells, fox_age, fox_food):
+        """
+        Substitui o conteúdo do campo pelos animais dados (no formato de
+        export_population), colocando-os na ordem dos arrays.
+        """
+        self.clear()
+        for cell, age in zip(rabbit_cells.tolist(), rabbit_age.tolist()):
+            rabbit = Rabbit(False, cell)
+            rabbit.age = age
+            self.place_rabbit(rabbit, cell)
+        for cell, age, food in zip(fox_cells.tolist(), fox_age.tolist(), fox_food.tolist()):
+            fox = Fox(False, cell, food)
+            fox.age = age
+            self.place_fox(fox, cell)
+
+    def get_state_hash(self):
+        """
+        Retorna o hash de Zobrist do conteúdo do campo (ver Zobrist). O
+        hash é atualizado a cada animal colocado ou retirado; a chave de
+        cada animal usa a idade e a comida que ele tinha ao ser colocado.
+        """
+        return self.state_hash
 
     def is_viable(self):
         """
         Retorna se há pelo menos um coelho e uma raposa no campo.
         """
-        has_rabbits = any(rabbit.is_alive() for rabbit in self.rabbits)
-        has_foxes = any(fox.is_alive() for fox in self.foxes)
-        return has_rabbits and has_foxes
-
-    def get_depth(self):
-        """Retorna a profundidade do campo."""
-        return self.depth
-
-    def get_width(self):
-        """Retorna a largura do campo."""
-        return self.width
+        return len(self.rabbits) > 0 and len(self.foxes) > 0
 
     def get_rabbits(self):
         """Retorna uma lista dos coelhos que estão vivos."""
-        return [rabbit for rabbit in self.rabbits if rabbit.is_alive()]
+        return list(self.rabbits)
 
     def get_foxes(self):
         """Retorna uma lista das raposas que estão vivas."""
-        return [fox for fox in self.foxes if fox.is_alive()]
+        return list(self.foxes)
+
+    def _occupied_cells(self):
+        """
+        Percorre as células ocupadas de cada espécie, como pares (array de
+        células, código), coelhos primeiro.
+        """
+        for registry, code in ((self.rabbits, self.RABBIT), (self.foxes, self.FOX)):
+            yield np.fromiter((animal.cell for animal in registry),
+                              dtype=np.int64, count=len(registry)), code
+
+    def _discard(self, animal):
+        """
+        Retira um animal do registro de sua espécie, se estiver lá, e
+        atualiza as contagens e o hash.
+        """
+        if isinstance(animal, Rabbit):
+            key = self.rabbits.pop(animal)
+            if key is not None:
+                self.stats.decrement_count(Rabbit)
+                self.state_hash ^= key
+        elif isinstance(animal, Fox):
+            key = self.foxes.pop(animal)
+            if key is not None:
+                self.stats.decrement_count(Fox)
+                self.state_hash ^= key
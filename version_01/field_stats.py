@@ -1,15 +1,23 @@
 
 # field_stats.py
 from counter import Counter
-from location import Location
 
 class FieldStats:
     """
     Esta classe coleta e fornece alguns dados estatísticos sobre o estado
     de um campo. É flexível: criará e manterá um contador para qualquer
     classe de objeto encontrada no campo.
+
+    Um Field mantém o seu próprio FieldStats atualizado a cada colocação,
+    morte ou sobrescrita de animal, de modo que as contagens podem ser
+    lidas a qualquer momento sem percorrer a grade. Com DEBUG ligado, o
+    Simulator confere essas contagens com uma varredura completa a cada
+    passo.
     """
 
+    # Se True, as contagens incrementais são conferidas a cada passo
+    DEBUG = False
+
     def __init__(self):
         """Constrói um objeto FieldStats."""
         # Contadores para cada tipo de entidade (raposa, coelho, etc.) na simulação
@@ -56,6 +64,47 @@ class FieldStats:
         self.counters[animal_class].increment()
 
 
+    def decrement_count(self, animal_class):
+        """
+        Decrementa o contador para uma classe de animal.
+        :param animal_class: A classe do animal a decrementar
+        """
+        self.counters[animal_class].decrement()
+
+    def set_count(self, animal_class, count):
+        """
+        Define diretamente o contador para uma classe de animal.
+        :param animal_class: A classe do animal
+        :param count: O número de animais dessa classe
+        """
+        if animal_class not in self.counters:
+            self.counters[animal_class] = Counter(animal_class.__name__)
+
+        self.counters[animal_class].set_count(count)
+
+    def get_count(self, animal_class):
+        """
+        Retorna o contador atual para uma classe de animal.
+        :param animal_class: A classe do animal
+        """
+        counter = self.counters.get(animal_class)
+        if counter is None:
+            return 0
+        return counter.get_count()
+
+    def check_counts(self, field):
+        """
+        Confere as contagens atuais com uma varredura completa do campo.
+        :raises AssertionError: Se alguma contagem estiver errada
+        """
+        scanned = self._scan_counts(field)
+        for animal_class in set(scanned) | set(self.counters):
+            expected = scanned.get(animal_class, 0)
+            actual = self.get_count(animal_class)
+            assert actual == expected, (
+                f"Contagem de {animal_class.__name__} incorreta: "
+                f"{actual} (esperado {expected})")
+
     def count_finished(self):
         """Indica que uma contagem de animais foi completada."""
         self.counts_valid = True
@@ -73,14 +122,30 @@ class FieldStats:
     def _generate_counts(self, field):
         """
         Generates counts of the number of foxes and rabbits.
-        These are not kept up to date as foxes and rabbits
-        are placed on the field, but only when a request
-        is made for the information.
+        Used when the counts are not valid; a Field keeps its
+        own FieldStats up to date as animals are placed and die.
         """
         self.reset()
-        for row in range(field.get_depth()):
-            for col in range(field.get_width()):
-                animal = field.get_object_at(Location(row, col))
-                if animal is not None:
-                    self.increment_count(type(animal))
+        for animal_class, count in self._scan_counts(field).items():
+            self.set_count(animal_class, count)
         self.counts_valid = True
+
+    def _scan_counts(self, field):
+        """
+        Conta os animais vivos percorrendo todas as células do campo (ou,
+        em campos que oferecem iter_animals, como o ChunkedField, só os
+        animais guardados).
+        :return: Um dicionário {classe: contagem}
+        """
+        iter_animals = getattr(field, 'iter_animals', None)
+        if iter_animals is not None:
+            animals = iter_animals()
+        else:
+            animals = (field.get_object_at(cell)
+                       for cell in range(field.get_depth() * field.get_width()))
+        counts = {}
+        for animal in animals:
+            if animal is not None and animal.is_alive():
+                animal_class = type(animal)
+                counts[animal_class] = counts.get(animal_class, 0) + 1
+        return counts
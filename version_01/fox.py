@@ -8,6 +8,9 @@ class Fox:
     Raposas envelhecem, se movem, comem coelhos e morrem.
     """
 
+    # Atributos de cada raposa (sem __dict__ por instância)
+    __slots__ = ('alive', 'cell', 'age', 'food_level', 'field')
+
     # Características compartilhadas por todas as raposas (variáveis de classe)
     BREEDING_AGE = 15        # A idade na qual uma raposa pode começar a procriar
     MAX_AGE = 150           # A idade até a qual uma raposa pode viver
@@ -15,20 +18,26 @@ class Fox:
     MAX_LITTER_SIZE = 2     # O número máximo de nascimentos
     RABBIT_FOOD_VALUE = 9   # O valor alimentar de um único coelho
 
-    def __init__(self, random_age, location):
+    def __init__(self, random_age, location, food_level=None):
         """
         Cria uma raposa. Uma raposa pode ser criada como recém-nascida
         (idade zero e sem fome) ou com idade e nível de fome aleatórios.
+        Se food_level for dado, ele é usado no lugar do sorteio.
         """
         self.alive = True
-        self.location = location
+        # A célula (row * width + col) ocupada; uma Location também é aceita
+        # até o animal ser colocado em um campo, que a converte em célula
+        self.cell = location
+        self.field = None  # O campo onde o animal foi colocado por último
         self.age = 0
 
         rand = Randomizer.get_random()
         if random_age:
             self.age = rand.randint(0, self.MAX_AGE - 1)
 
-        self.food_level = rand.randint(0, self.RABBIT_FOOD_VALUE - 1)
+        if food_level is None:
+            food_level = rand.randint(0, self.RABBIT_FOOD_VALUE - 1)
+        self.food_level = food_level
 
     def hunt(self, current_field, next_field_state):
         """
@@ -40,20 +49,20 @@ class Fox:
         self._increment_hunger()
 
         if self.alive:
-            free_locations = next_field_state.get_free_adjacent_locations(self.location)
-            if free_locations:
-                self._give_birth(next_field_state, free_locations)
+            free_cells = next_field_state.get_free_adjacent_cells(self.cell)
+            if free_cells:
+                self._give_birth(next_field_state, free_cells)
 
             # Move em direção a uma fonte de comida se encontrada
-            new_location = self._find_food(current_field)
-            if new_location is None and free_locations:
-                # Nenhuma comida encontrada - tenta se mover para uma localização livre
-                new_location = free_locations.pop(0)
+            new_cell = self._find_food(current_field)
+            if new_cell is None and free_cells:
+                # Nenhuma comida encontrada - tenta se mover para uma célula livre
+                new_cell = free_cells.pop(0)
 
             # Verifica se foi possível se mover
-            if new_location is not None:
-                self.location = new_location
-                next_field_state.place_fox(self, new_location)
+            if new_cell is not None:
+                self.cell = new_cell
+                next_field_state.place_fox(self, new_cell)
             else:
                 # Superpopulação
                 self.set_dead()
@@ -66,13 +75,26 @@ class Fox:
         """Retorna a localização da raposa."""
         return self.location
 
+    @property
+    def location(self):
+        """
+        A localização da raposa, obtida a partir da célula pelo campo
+        onde ela está (None se estiver morta).
+        """
+        if self.field is None:
+            return self.cell
+        return self.field.location_of(self.cell)
+
     def set_dead(self):
         """
         Indica que a raposa não está mais viva.
         Ela é removida do campo.
         """
         self.alive = False
-        self.location = None
+        if self.field is not None:
+            self.field.notify_death(self)
+            self.field = None
+        self.cell = None
 
     def __str__(self):
         return f"Fox(age={self.age}, alive={self.alive}, location={self.location}, food_level={self.food_level})"
@@ -91,33 +113,34 @@ class Fox:
 
     def _find_food(self, field):
         """
-        Procura por coelhos adjacentes à localização atual.
+        Procura por coelhos adjacentes à célula atual.
         Apenas o primeiro coelho vivo é comido.
+        :return: A célula do coelho comido, ou None
         """
-        adjacent = field.get_adjacent_locations(self.location)
+        adjacent = field.get_adjacent_cells(self.cell)
 
-        for loc in adjacent:
-            animal = field.get_object_at(loc)
+        for cell in adjacent:
+            animal = field.get_object_at(cell)
             if isinstance(animal, Rabbit) and animal.is_alive():
                 animal.set_dead()
                 self.food_level = self.RABBIT_FOOD_VALUE
-                return loc
+                return cell
 
         return None
 
-    def _give_birth(self, next_field_state, free_locations):
+    def _give_birth(self, next_field_state, free_cells):
         """
         Verifica se esta raposa deve dar à luz neste passo.
-        Novos nascimentos serão feitos em localizações adjacentes livres.
+        Novos nascimentos serão feitos em células adjacentes livres.
         """
         births = self._breed()
         if births > 0:
             for b in range(births):
-                if not free_locations:
+                if not free_cells:
                     break
-                loc = free_locations.pop(0)
-                young = Fox(False, loc)
-                next_field_state.place_fox(young, loc)
+                cell = free_cells.pop(0)
+                young = Fox(False, cell)
+                next_field_state.place_fox(young, cell)
 
     def _breed(self):
         """
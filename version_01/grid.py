@@ -0,0 +1,124 @@
+# grid.py
+import numpy as np
+from randomizer import Randomizer
+from rabbit import Rabbit
+from fox import Fox
+from location import Location
+from neighbor_index import NeighborIndex
+
+
+def downsample(grid, rows, cols):
+    """
+    Reduz a grade para caber em rows × cols posições. Cada posição
+    representa um bloco de células e mostra o maior código do bloco: uma
+    raposa aparece mesmo entre coelhos, e um coelho entre células vazias.
+    """
+    depth, width = grid.shape
+    block_rows = -(-depth // rows)
+    block_cols = -(-width // cols)
+    if block_rows == 1 and block_cols == 1:
+        return grid
+    padded = np.zeros((-(-depth // block_rows) * block_rows,
+                       -(-width // block_cols) * block_cols), dtype=grid.dtype)
+    padded[:depth, :width] = grid
+    blocks = padded.reshape(padded.shape[0] // block_rows, block_rows,
+                            padded.shape[1] // block_cols, block_cols)
+    return blocks.max(axis=(1, 3))
+
+
+class Grid:
+    """
+    Base comum de Field e ArrayField: as dimensões da grade, a conversão
+    entre células (row * width + col) e Locations e a vizinhança de cada
+    célula. Cada subclasse guarda os animais do seu jeito e responde
+    get_free_adjacent_cells, get_object_at, snapshot, downsampled_snapshot
+    e stats.
+    """
+
+    # Códigos de espécie (species do ArrayField e snapshot())
+    EMPTY = 0
+    RABBIT = 1
+    FOX = 2
+    # Se a vizinhança é calculada sob demanda, sem listas do tamanho da
+    # grade (ver SparseNeighborIndex)
+    SPARSE_NEIGHBORS = False
+
+    def __init__(self, depth, width):
+        """
+        Representa uma grade com as dimensões dadas.
+        """
+        self.depth = depth
+        self.width = width
+        self._rand = Randomizer.get_random()
+        # Vizinhança pré-calculada, compartilhada entre campos do mesmo tamanho
+        self.neighbors = NeighborIndex.get(depth, width, self.SPARSE_NEIGHBORS)
+
+    def get_free_adjacent_locations(self, location):
+        """
+        Obtém uma lista embaralhada das localizações adjacentes livres.
+        """
+        cells = self.get_free_adjacent_cells(self._cell(location))
+        return [self.neighbors.location(cell) for cell in cells]
+
+    def get_adjacent_locations(self, location):
+        """
+        Retorna uma lista embaralhada de localizações adjacentes à dada.
+        A lista não incluirá a própria localização.
+        Todas as localizações estarão dentro da grade.
+        """
+        if location is None:
+            return []
+        cells = self.get_adjacent_cells(self._cell(location))
+        return [self.neighbors.location(cell) for cell in cells]
+
+    def get_adjacent_cells(self, cell):
+        """
+        Retorna uma lista embaralhada das células adjacentes à dada.
+        A lista não incluirá a própria célula.
+        """
+        cells = list(self.neighbors.neighbors(cell))
+
+        # Embaralha a lista. Vários outros métodos dependem da lista
+        # estar em ordem aleatória
+        self._rand.shuffle(cells)
+        return cells
+
+    def field_stats(self):
+        """Imprime o número de raposas e coelhos no campo."""
+        num_foxes = self.stats.get_count(Fox)
+        num_rabbits = self.stats.get_count(Rabbit)
+
+        print(f"Rabbits: {num_rabbits} Foxes: {num_foxes}")
+
+    def block_size(self, rows, cols):
+        """
+        Retorna o tamanho (linhas, colunas) dos blocos de células que
+        reduzem a grade a no máximo rows × cols posições (ver
+        downsampled_snapshot).
+        """
+        return -(-self.depth // max(1, rows)), -(-self.width // max(1, cols))
+
+    def location_of(self, cell):
+        """Retorna a localização (compartilhada) de uma célula."""
+        return self.neighbors.location(cell)
+
+    def location_at(self, row, col):
+        """
+        Retorna a localização (única, compartilhada entre campos do mesmo
+        tamanho) da posição dada.
+        """
+        return self.neighbors.location(row * self.width + col)
+
+    def get_depth(self):
+        """Retorna a profundidade do campo."""
+        return self.depth
+
+    def get_width(self):
+        """Retorna a largura do campo."""
+        return self.width
+
+    def _cell(self, location):
+        """Converte uma localização no índice da célula; células passam direto."""
+        if isinstance(location, Location):
+            return location.row * self.width + location.col
+        return location
@@ -1,6 +1,13 @@
 # location.py
 class Location:
-    """Representa uma localização em uma grade retangular."""
+    """
+    Representa uma localização em uma grade retangular.
+    Os campos reaproveitam uma única instância por célula (ver
+    NeighborIndex.location), em vez de criar localizações novas a cada
+    consulta.
+    """
+
+    __slots__ = ('row', 'col')
 
     def __init__(self, row, col):
         self.row = row
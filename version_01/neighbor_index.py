@@ -0,0 +1,164 @@
+# neighbor_index.py
+import weakref
+import numpy as np
+from location import Location
+
+# Deslocamentos (linha, coluna) das oito células vizinhas, na mesma ordem
+# em que Field sempre percorreu a vizinhança
+OFFSETS = ((-1, -1), (-1, 0), (-1, 1),
+           (0, -1),           (0, 1),
+           (1, -1),  (1, 0),  (1, 1))
+
+
+class NeighborIndex:
+    """
+    Índice de vizinhança de uma grade com depth linhas e width colunas.
+    As células são identificadas pelo índice plano row * width + col.
+
+    O índice é calculado uma única vez para cada tamanho de grade e
+    compartilhado por todos os campos desse tamanho (ver get). Quem mantém
+    o índice vivo são os campos: quando o último campo de um tamanho é
+    descartado, o índice (e as listas do tamanho da grade) também é. Cada parte
+    (as tuplas por célula usadas pelos animais e a tabela NumPy usada pelo
+    VectorizedStepper) só é alocada quando alguém a usa.
+    """
+
+    # Índices em uso, por (depth, width, sparse); as referências fortes
+    # ficam nos campos (Grid.neighbors)
+    _indexes = weakref.WeakValueDictionary()
+
+    @staticmethod
+    def get(depth, width, sparse=False):
+        """
+        Retorna o índice compartilhado para o tamanho de grade dado.
+        :param sparse: Se True, um SparseNeighborIndex, que não reserva
+                       nada por célula (para campos esparsos, como o
+                       ChunkedField)
+        """
+        key = (depth, width, sparse)
+        index = NeighborIndex._indexes.get(key)
+        if index is None:
+            if sparse:
+                index = SparseNeighborIndex(depth, width)
+            else:
+                index = NeighborIndex(depth, width)
+            NeighborIndex._indexes[key] = index
+        return index
+
+    def __init__(self, depth, width):
+        """
+        Constrói o índice. Prefira NeighborIndex.get, que reaproveita
+        índices já construídos.
+        """
+        self.depth = depth
+        self.width = width
+        self._table = None
+        # Tuplas de vizinhos e localizações por célula; as listas são
+        # criadas e preenchidas a partir da primeira consulta
+        self._cells = None
+        self._locations = None
+
+    def neighbors(self, cell):
+        """
+        Retorna uma tupla com as células vizinhas de cell (sem a própria
+        célula e sem posições fora da grade). A tupla é compartilhada:
+        consultas repetidas não criam objetos novos.
+        """
+        try:
+            cells = self._cells[cell]
+        except TypeError:
+            self._cells = [None] * (self.depth * self.width)
+            cells = None
+        if cells is None:
+            row, col = divmod(cell, self.width)
+            cells = tuple((row + roffset) * self.width + col + coffset
+                          for roffset, coffset in OFFSETS
+                          if 0 <= row + roffset < self.depth
+                          and 0 <= col + coffset < self.width)
+            self._cells[cell] = cells
+        return cells
+
+    def location(self, cell):
+        """
+        Retorna a localização (única, compartilhada) da célula dada.
+        """
+        try:
+            location = self._locations[cell]
+        except TypeError:
+            self._locations = [None] * (self.depth * self.width)
+            location = None
+        if location is None:
+            location = Location(*divmod(cell, self.width))
+            self._locations[cell] = location
+        return location
+
+    def get_table(self):
+        """
+        Retorna a tabela de vizinhos como array NumPy: uma linha por célula
+        com os índices das oito vizinhas, ou -1 quando a vizinha cai fora
+        da grade. Os índices são int32 sempre que cabem, para ocupar metade
+        da memória.
+        """
+        if self._table is None:
+            size = self.depth * self.width
+            dtype = np.int32 if size <= np.iinfo(np.int32).max else np.int64
+            rows, cols = np.divmod(np.arange(size, dtype=dtype), self.width)
+            table = np.full((size, len(OFFSETS)), -1, dtype=dtype)
+            for k, (roffset, coffset) in enumerate(OFFSETS):
+                next_rows = rows + roffset
+                next_cols = cols + coffset
+                inside = ((next_rows >= 0) & (next_rows < self.depth) &
+                          (next_cols >= 0) & (next_cols < self.width))
+                table[inside, k] = next_rows[inside] * self.width + next_cols[inside]
+            self._table = table
+        return self._table
+
+
+class SparseNeighborIndex(NeighborIndex):
+    """
+    Um NeighborIndex para campos esparsos em grades enormes (ver
+    Field.SPARSE_NEIGHBORS): guarda vizinhos e localizações só das células
+    já consultadas, em dicionários, em vez de listas do
+    tamanho da grade. Os dicionários são esvaziados ao passar de
+    CACHE_LIMIT células, para que a memória não cresça com a área
+    percorrida pelos animais.
+    """
+
+    # Máximo de células guardadas em cada dicionário
+    CACHE_LIMIT = 1 << 20
+
+    def __init__(self, depth, width):
+        """Constrói o índice, sem nenhuma célula calculada."""
+        self.depth = depth
+        self.width = width
+        self._table = None
+        self._cells = {}
+        self._locations = {}
+
+    def neighbors(self, cell):
+        """Retorna uma tupla com as células vizinhas de cell."""
+        cells = self._cells.get(cell)
+        if cells is None:
+            if len(self._cells) >= self.CACHE_LIMIT:
+                self._cells.clear()
+            row, col = divmod(cell, self.width)
+            cells = tuple((row + roffset) * self.width + col + coffset
+                          for roffset, coffset in OFFSETS
+                          if 0 <= row + roffset < self.depth
+                          and 0 <= col + coffset < self.width)
+            self._cells[cell] = cells
+        return cells
+
+    def location(self, cell):
+        """Retorna a localização da célula dada."""
+        location = self._locations.get(cell)
+        if location is None:
+            if len(self._locations) >= self.CACHE_LIMIT:
+                self._locations.clear()
+            location = Location(*divmod(cell, self.width))
+            self._locations[cell] = location
+        return location
+
+    def get_table(self):
+        """Retorna a tabela do índice denso do mesmo tamanho (ver NeighborIndex)."""
+        return NeighborIndex.get(self.depth, self.width).get_table()
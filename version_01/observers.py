@@ -0,0 +1,264 @@
+# observers.py
+from collections import deque
+import numpy as np
+from rabbit import Rabbit
+from fox import Fox
+from checkpoint import save_checkpoint
+
+class SimulationObserver:
+    """
+    Um observador da simulação. O Simulator avisa cada observador
+    registrado depois de cada passo (e depois de um reset), respeitando o
+    intervalo (stride) de passos de cada um.
+    """
+
+    def __init__(self, stride=1):
+        """
+        Cria um observador.
+        :param stride: O observador é avisado a cada stride passos
+        """
+        self.stride = max(1, stride)
+
+    def wants(self, step):
+        """Verifica se o observador deve ser avisado neste passo."""
+        return step % self.stride == 0
+
+    def on_step(self, step, field):
+        """Recebe o estado do campo depois de um passo."""
+        raise NotImplementedError
+
+    def should_stop(self):
+        """
+        Verifica se o observador pede o fim da simulação; Simulator.simulate
+        para antes do próximo passo.
+        """
+        return False
+
+    def close(self):
+        """Libera recursos do observador ao fim da simulação."""
+        pass
+
+
+class ViewObserver(SimulationObserver):
+    """Repassa o estado do campo para uma SimulatorView."""
+
+    def __init__(self, view, stride=1):
+        super().__init__(stride)
+        self.view = view
+
+    def on_step(self, step, field):
+        self.view.show_status(step, field)
+
+    def close(self):
+        self.view.close()
+
+
+class LoggerObserver(SimulationObserver):
+    """Imprime o número de coelhos e raposas, como Simulator.report_stats."""
+
+    def on_step(self, step, field):
+        print(f"Step: {step} ", end="")
+        field.field_stats()
+
+
+class StatsObserver(SimulationObserver):
+    """Guarda a evolução das populações, sem imprimir nem desenhar nada."""
+
+    def __init__(self, stride=1):
+        super().__init__(stride)
+        self.history = {
+            'steps': [],
+            'rabbits': [],
+            'foxes': []
+        }
+
+    def on_step(self, step, field):
+        self.history['steps'].append(step)
+        self.history['rabbits'].append(field.stats.get_count(Rabbit))
+        self.history['foxes'].append(field.stats.get_count(Fox))
+
+
+class TelemetryObserver(SimulationObserver):
+    """Repassa as contagens de cada passo para um TelemetrySink."""
+
+    def __init__(self, sink, stride=1):
+        super().__init__(stride)
+        self.sink = sink
+
+    def on_step(self, step, field):
+        self.sink.record(step, field.stats.get_count(Rabbit), field.stats.get_count(Fox))
+
+    def close(self):
+        self.sink.close()
+
+
+class CheckpointObserver(SimulationObserver):
+    """
+    Grava periodicamente um checkpoint do simulador (sempre no mesmo
+    arquivo, substituindo o anterior).
+    """
+
+    def __init__(self, simulator, path, stride=1000):
+        super().__init__(stride)
+        self.simulator = simulator
+        self.path = path
+
+    def on_step(self, step, field):
+        save_checkpoint(self.simulator, self.path)
+
+
+class SteadyStateDetector(SimulationObserver):
+    """
+    Pede o fim da simulação quando ela deixa de mudar de forma útil:
+
+    - 'cycle': o campo repete estados já vistos (mesmo hash de Zobrist,
+      ver Field.get_state_hash) com o mesmo período, em confirmations
+      passos observados seguidos, dentro dos últimos memory passos;
+    - 'stationary': nos últimos window passos, a média das populações de
+      cada quarto da janela fica dentro de tolerance (fração) da média da
+      janela inteira, para as duas espécies.
+
+    As duas regras são heurísticas. Por padrão, o hash só considera a
+    espécie em cada célula (ver Zobrist.AGE_BUCKET e FOOD_BUCKET): dois
+    estados com o mesmo desenho mas idades ou comida diferentes têm o
+    mesmo hash, e um modelo aleatório não evolui igual a partir deles. Por
+    isso uma única repetição não basta para 'cycle'; o período precisa se
+    confirmar passo após passo.
+
+    Depois de detectar, reason, period (só em 'cycle') e detected_at
+    descrevem o que foi visto. Um reset da simulação recomeça a detecção.
+    """
+
+    def __init__(self, window=500, tolerance=0.02, memory=1000, confirmations=10, stride=1):
+        """
+        Cria um detector.
+        :param window: Quantos passos formam a janela de populações
+        :param tolerance: A variação tolerada entre as médias, como fração
+        :param memory: Por quantos passos cada hash é lembrado
+        :param confirmations: Quantos passos observados seguidos precisam
+                              repetir um estado com o mesmo período para
+                              que seja um 'cycle'
+        """
+        super().__init__(stride)
+        self.window = max(4, window)
+        self.tolerance = tolerance
+        self.memory = max(1, memory)
+        self.confirmations = max(1, confirmations)
+        self._reset()
+
+    def on_step(self, step, field):
+        if step <= self._last_step:
+            self._reset()
+        if self.reason is not None:
+            return
+        self._last_step = step
+
+        state_hash = field.get_state_hash()
+        previous = self._seen.get(state_hash)
+        period = None if previous is None else step - previous
+        if period is not None and period == self._period:
+            self._streak += 1
+        else:
+            self._period = period
+            self._streak = 0 if period is None else 1
+        if self._streak >= self.confirmations:
+            self._detect('cycle', step, period)
+            return
+
+        self._seen[state_hash] = step
+        self._hashes.append((state_hash, step))
+        if len(self._hashes) > self.memory:
+            old_hash, old_step = self._hashes.popleft()
+            # O hash pode ter sido visto de novo depois; só a última vez conta
+            if self._seen.get(old_hash) == old_step:
+                del self._seen[old_hash]
+
+        self._counts.append((field.stats.get_count(Rabbit), field.stats.get_count(Fox)))
+        if len(self._counts) == self.window and self._is_stationary():
+            self._detect('stationary', step)
+
+    def should_stop(self):
+        return self.reason is not None
+
+    def _is_stationary(self):
+        """Compara a média de cada quarto da janela com a da janela toda."""
+        counts = np.array(self._counts, dtype=float)
+        means = counts.mean(axis=0)
+        quarters = np.array([part.mean(axis=0) for part in np.array_split(counts, 4)])
+        limit = self.tolerance * np.maximum(means, 1.0)
+        return bool(np.all(np.abs(quarters - means) <= limit))
+
+    def _detect(self, reason, step, period=None):
+        """Registra a detecção."""
+        self.reason = reason
+        self.period = period
+        self.detected_at = step
+
+    def _reset(self):
+        """Esquece tudo o que foi visto."""
+        self._seen = {}
+        self._hashes = deque()
+        self._period = None   # Período das repetições seguidas mais recentes
+        self._streak = 0      # Quantas repetições seguidas tiveram esse período
+        self._counts = deque(maxlen=self.window)
+        self._last_step = -1
+        self.reason = None
+        self.period = None
+        self.detected_at = None
+
+
+class AnimationObserver(SimulationObserver):
+    """
+    Acrescenta a grade de cada passo observado a um AnimationWriter, que
+    grava um único PNG animado em vez de uma imagem por passo. Grades
+    maiores que o quadro são reduzidas pelo próprio campo
+    (downsampled_snapshot), sem criar um array do tamanho da grade.
+    """
+
+    # Tamanho máximo de cada quadro, em células
+    FRAME_ROWS = 1000
+    FRAME_COLS = 1000
+
+    def __init__(self, writer, stride=1, rows=None, cols=None):
+        """
+        :param writer: O AnimationWriter que recebe os quadros
+        :param rows: Linhas máximas de cada quadro; por padrão, FRAME_ROWS
+        :param cols: Colunas máximas de cada quadro; por padrão, FRAME_COLS
+        """
+        super().__init__(stride)
+        self.writer = writer
+        self.rows = rows if rows is not None else self.FRAME_ROWS
+        self.cols = cols if cols is not None else self.FRAME_COLS
+
+    def on_step(self, step, field):
+        self.writer.add_frame(field.downsampled_snapshot(self.rows, self.cols))
+
+    def close(self):
+        self.writer.close()
+
+
+class TerminalObserver(SimulationObserver):
+    """
+    Mostra a grade no terminal com um TerminalRenderer, para acompanhar
+    simulações sem interface gráfica. O campo reduz a grade ao tamanho do
+    terminal (downsampled_snapshot): o custo de cada imagem não cresce com
+    a área da grade.
+    """
+
+    def __init__(self, renderer, stride=1, rows=None, cols=None):
+        """
+        :param renderer: O TerminalRenderer que desenha a grade
+        :param rows: Linhas máximas da imagem; por padrão, as do renderer
+        :param cols: Colunas máximas da imagem; por padrão, as do renderer
+        """
+        super().__init__(stride)
+        self.renderer = renderer
+        self.rows = rows if rows is not None else renderer.rows
+        self.cols = cols if cols is not None else renderer.cols
+
+    def on_step(self, step, field):
+        self.renderer.render(field.downsampled_snapshot(self.rows, self.cols), step,
+                             field.stats.get_count(Rabbit), field.stats.get_count(Fox))
+
+    def close(self):
+        self.renderer.close()
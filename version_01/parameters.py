@@ -0,0 +1,76 @@
+# parameters.py
+from rabbit import Rabbit
+from fox import Fox
+from simulator import Simulator
+from zobrist import Zobrist
+
+class SimulationParameters:
+    """
+    Um conjunto de valores para as constantes de classe da simulação
+    (por exemplo Fox.BREEDING_PROBABILITY ou Rabbit.MAX_AGE), para uma
+    execução. Os nomes seguem o formato "Classe.CONSTANTE".
+
+    Como as constantes são atributos de classe, os valores só valem
+    enquanto estão aplicados (entre apply e restore). Cada execução de uma
+    varredura roda em seu próprio processo, que aplica os parâmetros dela.
+    """
+
+    # As classes cujas constantes podem ser alteradas
+    TARGETS = {
+        'Rabbit': Rabbit,
+        'Fox': Fox,
+        'Simulator': Simulator,
+        'Zobrist': Zobrist
+    }
+
+    def __init__(self, values=None):
+        """
+        Cria um conjunto de parâmetros.
+        :param values: Um dicionário {"Classe.CONSTANTE": valor}
+        """
+        self.values = {}
+        self._previous = None
+        if values is not None:
+            for name, value in values.items():
+                self.set(name, value)
+
+    def set(self, name, value):
+        """Define o valor de uma constante, ex: set("Fox.MAX_AGE", 120)."""
+        target, attribute = self._resolve(name)
+        if not hasattr(target, attribute):
+            raise ValueError(f"Parâmetro desconhecido: {name}")
+        self.values[name] = value
+
+    def get(self, name):
+        """Retorna o valor definido, ou o valor atual da constante."""
+        if name in self.values:
+            return self.values[name]
+        target, attribute = self._resolve(name)
+        return getattr(target, attribute)
+
+    def apply(self):
+        """Aplica os valores às classes, guardando os valores anteriores."""
+        self._previous = {}
+        for name, value in self.values.items():
+            target, attribute = self._resolve(name)
+            self._previous[name] = getattr(target, attribute)
+            setattr(target, attribute, value)
+
+    def restore(self):
+        """Devolve às classes os valores que tinham antes de apply."""
+        if self._previous is None:
+            return
+        for name, value in self._previous.items():
+            target, attribute = self._resolve(name)
+            setattr(target, attribute, value)
+        self._previous = None
+
+    def _resolve(self, name):
+        """Separa "Classe.CONSTANTE" na classe e no nome do atributo."""
+        class_name, _, attribute = name.partition('.')
+        if class_name not in self.TARGETS or not attribute:
+            raise ValueError(f"Parâmetro desconhecido: {name}")
+        return self.TARGETS[class_name], attribute
+
+    def __str__(self):
+        return f"SimulationParameters({self.values})"
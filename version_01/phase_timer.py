@@ -0,0 +1,89 @@
+# phase_timer.py
+import time
+import numpy as np
+
+
+class PhaseTimer:
+    """
+    Mede quanto tempo cada fase de um passo da simulação leva (coelhos,
+    raposas, observadores, ...) e quantos animais cada fase processou.
+
+    As medidas de window passos são agregadas em um relatório com a média
+    e o percentil 95 de cada fase; o relatório é entregue ao callback (se
+    houver) e fica disponível em get_report. Usa o relógio monotônico
+    time.perf_counter_ns.
+    """
+
+    def __init__(self, window=100, callback=None):
+        """
+        Cria um cronômetro de fases.
+        :param window: De quantos em quantos passos o relatório é gerado
+        :param callback: Função chamada com (step, relatório) a cada
+                         relatório gerado
+        """
+        self.window = max(1, window)
+        self.callback = callback
+        self._times = {}     # Duração de cada medida, por fase, em ns
+        self._animals = {}   # Animais processados em cada medida, por fase
+        self._steps = 0
+        self._report = {}
+
+    def start(self):
+        """Retorna o instante atual, a ser passado para stop."""
+        return time.perf_counter_ns()
+
+    def stop(self, phase, started, animals=0):
+        """
+        Registra uma medida da fase dada.
+        :param started: O valor retornado por start
+        :param animals: Quantos animais a fase processou
+        """
+        elapsed = time.perf_counter_ns() - started
+        if phase not in self._times:
+            self._times[phase] = []
+            self._animals[phase] = []
+        self._times[phase].append(elapsed)
+        self._animals[phase].append(animals)
+
+    def end_step(self, step):
+        """
+        Avisa o fim de um passo; a cada window passos gera o relatório e
+        recomeça a contagem.
+        """
+        self._steps += 1
+        if self._steps < self.window:
+            return
+        self._report = self._summarize()
+        self._times = {}
+        self._animals = {}
+        self._steps = 0
+        if self.callback is not None:
+            self.callback(step, self._report)
+
+    def get_report(self):
+        """
+        Retorna o último relatório gerado: para cada fase, um dicionário com
+        mean_ms, p95_ms, animals (média por medida) e count (medidas).
+        """
+        return self._report
+
+    def _summarize(self):
+        """Agrega as medidas guardadas em um relatório."""
+        report = {}
+        for phase, times in self._times.items():
+            milliseconds = np.array(times) / 1e6
+            report[phase] = {
+                'mean_ms': float(milliseconds.mean()),
+                'p95_ms': float(np.percentile(milliseconds, 95)),
+                'animals': float(np.mean(self._animals[phase])),
+                'count': len(times)
+            }
+        return report
+
+
+def print_report(step, report):
+    """Um callback que imprime o relatório em forma de tabela."""
+    print(f"Fases até o step {step}:")
+    for phase, values in report.items():
+        print(f"  {phase:28s} média {values['mean_ms']:8.3f} ms | "
+              f"p95 {values['p95_ms']:8.3f} ms | animais {values['animals']:10.1f}")
@@ -0,0 +1,140 @@
+# plot_renderer.py
+
+# Cores da grade: vazio, coelho, raposa
+GRID_COLORS = ['white', 'lightgreen', 'red']
+
+# Tamanho máximo da amostra do campo mostrada no gráfico
+MAX_DISPLAY_ROWS = 40
+MAX_DISPLAY_COLS = 60
+
+
+class PlotRenderer:
+    """
+    Desenha a amostra da grade e a evolução populacional e salva a imagem.
+
+    A figura é criada uma única vez; a cada quadro só os dados da imagem,
+    das linhas e dos textos são trocados (set_data / set_text), de modo que
+    o custo de um quadro depende do número de pixels, e não de recriar
+    eixos, legendas e imagem. Não depende do Field: recebe apenas a amostra
+    da grade (códigos 0 = vazio, 1 = coelho, 2 = raposa) e o histórico, e
+    pode ser usado tanto pela SimulatorView quanto pelo RenderWorker.
+    """
+
+    def __init__(self):
+        """Cria um desenhista; a figura só é criada no primeiro quadro."""
+        self.fig = None
+        self._shape = None
+
+    def render(self, display_grid, field_depth, field_width, step,
+               rabbit_count, fox_count, history, filename):
+        """
+        Atualiza a figura com o estado dado e a salva em filename.
+        :param history: Dicionário com as listas 'steps', 'rabbits' e 'foxes'
+        """
+        if self.fig is None or display_grid.shape != self._shape:
+            self._create_figure(display_grid.shape)
+
+        self.title.set_text(f"Simulação Predador-Presa - Step {step}")
+
+        # Plot 1: Grade do campo (amostra)
+        max_rows, max_cols = display_grid.shape
+        self.grid_image.set_data(display_grid)
+        self.grid_axes.set_title(f"Campo - Step {step}\n Coelhos: {rabbit_count} |  Raposas: {fox_count}")
+        self.grid_axes.set_xlabel(f"Largura (mostrando {max_cols}/{field_width})")
+        self.grid_axes.set_ylabel(f"Altura (mostrando {max_rows}/{field_depth})")
+
+        # Info se o campo foi truncado
+        truncated = field_depth > max_rows or field_width > max_cols
+        self.sample_text.set_visible(truncated)
+        if truncated:
+            self.sample_text.set_text(f"Amostra: {max_rows}×{max_cols}\nCampo real: {field_depth}×{field_width}")
+
+        # Plot 2: Evolução populacional
+        has_history = len(history['steps']) > 1
+        for artist in (self.rabbit_line, self.fox_line, self.rabbit_marker,
+                       self.fox_marker, self.current_text):
+            artist.set_visible(has_history)
+
+        if has_history:
+            self.rabbit_line.set_data(history['steps'], history['rabbits'])
+            self.fox_line.set_data(history['steps'], history['foxes'])
+
+            # Destaca ponto atual com marcadores maiores
+            self.rabbit_marker.set_data([step], [rabbit_count])
+            self.fox_marker.set_data([step], [fox_count])
+            self.current_text.set_text(f"Atual:\n Coelhos {rabbit_count}\nRaposas {fox_count}")
+
+            # Ajusta os limites dos eixos para os dados atuais
+            first_step = history['steps'][0]
+            last_step = max(history['steps'][-1], first_step + 1)
+            margin = (last_step - first_step) * 0.05
+            self.population_axes.set_xlim(first_step - margin, last_step + margin)
+            max_pop = max(max(history['rabbits']), max(history['foxes']))
+            self.population_axes.set_ylim(0, max(max_pop, 1) * 1.1)
+
+        # Salva a imagem
+        self.fig.savefig(filename, dpi=150, bbox_inches='tight', facecolor='white')
+
+    def close(self):
+        """Fecha a figura para liberar memória."""
+        if self.fig is not None:
+            import matplotlib.pyplot as plt
+            plt.close(self.fig)
+            self.fig = None
+
+    def _create_figure(self, shape):
+        """Cria a figura, os eixos e todos os elementos atualizados a cada quadro."""
+        # matplotlib só é carregado quando o primeiro quadro é desenhado
+        import matplotlib.pyplot as plt
+        from matplotlib.colors import ListedColormap
+        plt.ioff()  # Não interfere com o input do usuário
+
+        self.close()
+        self._shape = shape
+
+        self.fig, axes = plt.subplots(1, 2, figsize=(15, 6))
+        self.fig.patch.set_facecolor('white')
+        self.title = self.fig.suptitle("", fontsize=16, fontweight='bold')
+        self.grid_axes, self.population_axes = axes
+
+        # Plot 1: Grade do campo (amostra)
+        self.grid_image = self.grid_axes.imshow(
+            [[0] * shape[1]] * shape[0],
+            cmap=ListedColormap(GRID_COLORS), vmin=0, vmax=2, aspect='equal')
+
+        # Adiciona legenda de cores
+        legend_elements = [
+            plt.Rectangle((0,0),1,1, facecolor='lightgreen', label='Coelhos'),
+            plt.Rectangle((0,0),1,1, facecolor='red', label='Raposas'),
+            plt.Rectangle((0,0),1,1, facecolor='white', edgecolor='black', label='Vazio')
+        ]
+        self.grid_axes.legend(handles=legend_elements, loc='upper right', bbox_to_anchor=(1.0, 1.0))
+
+        self.sample_text = self.grid_axes.text(
+            0.02, 0.02, "",
+            transform=self.grid_axes.transAxes,
+            verticalalignment='bottom',
+            fontsize=8,
+            bbox=dict(boxstyle="round,pad=0.3", facecolor="yellow", alpha=0.7))
+
+        # Plot 2: Evolução populacional
+        ax = self.population_axes
+        self.rabbit_line, = ax.plot([], [], 'g-', label='Coelhos', linewidth=2.5, marker='o', markersize=3)
+        self.fox_line, = ax.plot([], [], 'r-', label='Raposas', linewidth=2.5, marker='s', markersize=3)
+        self.rabbit_marker, = ax.plot([], [], 'go', markersize=8, markeredgecolor='darkgreen', markeredgewidth=2)
+        self.fox_marker, = ax.plot([], [], 'ro', markersize=8, markeredgecolor='darkred', markeredgewidth=2)
+
+        self.current_text = ax.text(
+            0.02, 0.98, "",
+            transform=ax.transAxes,
+            verticalalignment='top',
+            fontsize=10,
+            bbox=dict(boxstyle="round,pad=0.3", facecolor="lightblue", alpha=0.8))
+
+        ax.set_title("Evolução Populacional")
+        ax.set_xlabel("Steps")
+        ax.set_ylabel("População")
+        ax.legend(loc='upper right')
+        ax.grid(True, alpha=0.3)
+
+        self.fig.tight_layout()
@@ -0,0 +1,54 @@
+# population_registry.py
+
+class PopulationRegistry:
+    """
+    Registro dos animais vivos de uma espécie em um campo.
+
+    Guarda os animais em um dicionário usado como conjunto ordenado:
+    inserção, remoção, teste de pertinência e contagem são O(1), e a
+    iteração segue a ordem de inserção (a mesma que a antiga lista com
+    append/remove produzia).
+    """
+
+    def __init__(self):
+        """Cria um registro vazio."""
+        self._animals = {}
+
+    def add(self, animal, key=None):
+        """
+        Registra um animal.
+        :param key: Um valor guardado junto com o animal (o Field guarda a
+                    chave de Zobrist com que o animal entrou no hash)
+        """
+        self._animals[animal] = key
+
+    def discard(self, animal):
+        """
+        Remove um animal, se estiver registrado.
+        :return: True se o animal estava registrado
+        """
+        if animal in self._animals:
+            del self._animals[animal]
+            return True
+        return False
+
+    def pop(self, animal, default=None):
+        """
+        Remove um animal, se estiver registrado.
+        :return: O valor guardado com o animal, ou default se ele não
+                 estava registrado
+        """
+        return self._animals.pop(animal, default)
+
+    def clear(self):
+        """Remove todos os animais."""
+        self._animals.clear()
+
+    def __contains__(self, animal):
+        return animal in self._animals
+
+    def __len__(self):
+        return len(self._animals)
+
+    def __iter__(self):
+        return iter(self._animals)
@@ -1,5 +1,4 @@
 from randomizer import Randomizer
-from location import Location
 
 # rabbit.py
 class Rabbit:
@@ -8,6 +7,9 @@ class Rabbit:
     Coelhos envelhecem, se movem, procriam e morrem.
     """
 
+    # Atributos de cada coelho (sem __dict__ por instância)
+    __slots__ = ('age', 'alive', 'cell', 'field')
+
     # Características compartilhadas por todos os coelhos (variáveis de classe)
     BREEDING_AGE = 5  # A idade na qual um coelho pode começar a procriar
     MAX_AGE = 40      # A idade até a qual um coelho pode viver
@@ -21,7 +23,10 @@ class Rabbit:
         """
         self.age = 0
         self.alive = True
-        self.location = location
+        # A célula (row * width + col) ocupada; uma Location também é aceita
+        # até o animal ser colocado em um campo, que a converte em célula
+        self.cell = location
+        self.field = None  # O campo onde o animal foi colocado por último
 
         rand = Randomizer.get_random()
         if random_age:
@@ -34,15 +39,15 @@ class Rabbit:
         """
         self._increment_age()
         if self.alive:
-            free_locations = next_field_state.get_free_adjacent_locations(self.location)
-            if free_locations:
-                self._give_birth(next_field_state, free_locations)
-
-            # Tenta se mover para uma localização livre
-            if free_locations:
-                new_location = free_locations[0]
-                self.location = new_location
-                next_field_state.place_rabbit(self, new_location)
+            free_cells = next_field_state.get_free_adjacent_cells(self.cell)
+            if free_cells:
+                self._give_birth(next_field_state, free_cells)
+
+            # Tenta se mover para uma célula livre
+            if free_cells:
+                new_cell = free_cells[0]
+                self.cell = new_cell
+                next_field_state.place_rabbit(self, new_cell)
             else:
                 # Superpopulação
                 self.set_dead()
@@ -57,12 +62,25 @@ class Rabbit:
         Ele é removido do campo.
         """
         self.alive = False
-        self.location = None
+        if self.field is not None:
+            self.field.notify_death(self)
+            self.field = None
+        self.cell = None
 
     def get_location(self):
         """Retorna a localização do coelho."""
         return self.location
 
+    @property
+    def location(self):
+        """
+        A localização do coelho, obtida a partir da célula pelo campo
+        onde ele está (None se estiver morto).
+        """
+        if self.field is None:
+            return self.cell
+        return self.field.location_of(self.cell)
+
     def __str__(self):
         return f"Rabbit(age={self.age}, alive={self.alive}, location={self.location})"
 
@@ -75,19 +93,19 @@ class Rabbit:
         if self.age > self.MAX_AGE:
             self.set_dead()
 
-    def _give_birth(self, next_field_state, free_locations):
+    def _give_birth(self, next_field_state, free_cells):
         """
         Verifica se este coelho deve dar à luz neste passo.
-        Novos nascimentos serão feitos em localizações adjacentes livres.
+        Novos nascimentos serão feitos em células adjacentes livres.
         """
         births = self._breed()
         if births > 0:
             for b in range(births):
-                if not free_locations:
+                if not free_cells:
                     break
-                loc = free_locations.pop(0)
-                young = Rabbit(False, loc)
-                next_field_state.place_rabbit(young, loc)
+                cell = free_cells.pop(0)
+                young = Rabbit(False, cell)
+                next_field_state.place_rabbit(young, cell)
 
     def _breed(self):
         """
@@ -1,5 +1,6 @@
 # randomizer.py
 import random
+from counter_random import CounterRandom
 
 class Randomizer:
     """
@@ -14,6 +15,8 @@ class Randomizer:
     _rand = random.Random(SEED)
     # Determina se um gerador aleatório compartilhado deve ser fornecido
     USE_SHARED = True
+    # Se o gerador compartilhado é um CounterRandom (veja set_counter_based)
+    COUNTER_BASED = False
 
     @staticmethod
     def get_random():
@@ -32,3 +35,27 @@ class Randomizer:
         """
         if Randomizer.USE_SHARED:
             Randomizer._rand.seed(Randomizer.SEED)
+
+    @staticmethod
+    def set_counter_based(enabled):
+        """
+        Troca o gerador compartilhado por um CounterRandom (ou de volta por
+        um random.Random), com a semente SEED. Os sorteios de cada animal
+        passam a depender só da semente, do passo e da célula dele, e não
+        da ordem em que os animais agem. Deve ser chamado antes de criar o
+        Simulator, pois os campos guardam o gerador ao serem criados.
+        """
+        Randomizer.COUNTER_BASED = enabled
+        if enabled:
+            Randomizer._rand = CounterRandom(Randomizer.SEED)
+        else:
+            Randomizer._rand = random.Random(Randomizer.SEED)
+
+    @staticmethod
+    def set_stream(step, id):
+        """
+        Com o gerador por contador, passa a sortear do fluxo (step, id).
+        Sem ele, não faz nada.
+        """
+        if Randomizer.COUNTER_BASED:
+            Randomizer._rand.set_key(step, id)
@@ -0,0 +1,123 @@
+# render_worker.py
+import multiprocessing as mp
+import queue
+
+
+def _render_loop(frames, results, image_dir, history_window):
+    """
+    Laço do processo de renderização: recebe quadros até receber None,
+    acumula os trechos de histórico (até history_window passos) e salva
+    um PNG por quadro.
+    """
+    import matplotlib
+    matplotlib.use('Agg')  # O processo nunca abre janelas
+    from plot_renderer import PlotRenderer
+
+    renderer = PlotRenderer()
+    history = {'steps': [], 'rabbits': [], 'foxes': []}
+    while True:
+        frame = frames.get()
+        if frame is None:
+            break
+
+        for key in history:
+            history[key].extend(frame['history'][key])
+        if history_window is not None:
+            excess = len(history['steps']) - history_window
+            if excess > 0:
+                for values in history.values():
+                    del values[:excess]
+
+        filename = f"{image_dir}/simulation_step_{frame['step']:06d}.png"
+        try:
+            renderer.render(frame['grid'], frame['depth'], frame['width'], frame['step'],
+                            frame['rabbits'], frame['foxes'], history, filename)
+            results.put(filename)
+        except Exception as e:
+            print(f"❌ Erro ao criar/salvar gráfico do Step {frame['step']}: {e}")
+    renderer.close()
+
+
+class RenderWorker:
+    """
+    Um processo separado que desenha e salva os gráficos da simulação,
+    para que o custo do matplotlib não atrase os passos.
+
+    O processo é alimentado por uma fila limitada de quadros. Cada quadro
+    leva só uma amostra compacta da grade, as contagens atuais e os pontos
+    do histórico surgidos desde o quadro anterior. Se a fila estiver cheia,
+    o quadro novo é descartado, mas seu trecho de histórico é guardado e
+    enviado junto com o próximo quadro aceito: nenhum ponto do gráfico de
+    populações se perde.
+    """
+
+    def __init__(self, image_dir, max_pending=2, history_window=None):
+        """
+        Inicia o processo de renderização.
+        :param image_dir: O diretório onde as imagens são salvas
+        :param max_pending: Quantos quadros podem esperar na fila
+        :param history_window: Quantos passos recentes o gráfico de
+                               populações mostra (None para todos)
+        """
+        self.image_dir = image_dir
+        self.dropped = 0  # Quadros descartados por falta de espaço na fila
+        self._frames = mp.Queue(maxsize=max(1, max_pending))
+        self._results = mp.Queue()
+        self._pending_history = None
+        self._last_dropped = None
+        self._process = mp.Process(target=_render_loop,
+                                   args=(self._frames, self._results, image_dir, history_window),
+                                   daemon=True)
+        self._process.start()
+
+    def submit(self, frame):
+        """
+        Envia um quadro sem bloquear a simulação.
+        :param frame: Dicionário com step, grid, depth, width, rabbits,
+                      foxes e history (os pontos novos do histórico)
+        :return: True se o quadro entrou na fila
+        """
+        if self._pending_history is not None:
+            frame['history'] = self._merge(self._pending_history, frame['history'])
+            self._pending_history = None
+
+        try:
+            self._frames.put_nowait(frame)
+        except queue.Full:
+            self.dropped += 1
+            self._pending_history = frame['history']
+            self._last_dropped = frame
+            return False
+        self._last_dropped = None
+        return True
+
+    def completed(self):
+        """Retorna os nomes das imagens salvas desde a última chamada."""
+        filenames = []
+        while True:
+            try:
+                filenames.append(self._results.get_nowait())
+            except queue.Empty:
+                return filenames
+
+    def close(self):
+        """
+        Espera a fila esvaziar e encerra o processo. O último quadro, se
+        tiver sido descartado, é enviado antes (bloqueando), para que a
+        imagem final reflita o fim da simulação.
+        """
+        if self._process is None:
+            return
+        if self._last_dropped is not None:
+            frame = self._last_dropped
+            frame['history'] = self._pending_history
+            self._frames.put(frame)
+            self._last_dropped = None
+            self._pending_history = None
+        self._frames.put(None)
+        self._process.join()
+        self._process = None
+
+    def _merge(self, older, newer):
+        """Junta dois trechos de histórico, o mais antigo primeiro."""
+        return {key: older[key] + newer[key] for key in older}
@@ -0,0 +1,57 @@
+# shared_array_field.py
+import weakref
+from multiprocessing import shared_memory
+import numpy as np
+from array_field import ArrayField
+
+
+def _unlink(blocks):
+    """
+    Apaga os nomes dos blocos de memória compartilhada. A memória em si é
+    liberada quando o último processo que a mapeia a fecha.
+    """
+    for block in blocks:
+        block.unlink()
+
+
+class SharedArrayField(ArrayField):
+    """
+    Um ArrayField cujos arrays (species, age e food) ficam em memória
+    compartilhada, de modo que outros processos podem ler e escrever o
+    mesmo campo sem copiá-lo (usado pelo TiledStepper).
+
+    O campo que cria os blocos é o dono deles e os apaga quando deixa de
+    ser usado; os outros processos apenas se conectam pelos nomes.
+    """
+
+    def __init__(self, depth, width, names=None):
+        """
+        Representa um campo com as dimensões dadas.
+        :param names: Os nomes dos blocos de um campo já existente (veja
+                      get_shared_names); se None, novos blocos são criados
+        """
+        super().__init__(depth, width)
+        owner = names is None
+        if owner:
+            names = (None, None, None)
+
+        self._blocks = []
+        arrays = []
+        for name, template in zip(names, (self.species, self.age, self.food)):
+            if owner:
+                block = shared_memory.SharedMemory(create=True, size=template.nbytes)
+            else:
+                block = shared_memory.SharedMemory(name=name)
+            array = np.ndarray(template.shape, dtype=template.dtype, buffer=block.buf)
+            if owner:
+                array[:] = template
+            self._blocks.append(block)
+            arrays.append(array)
+        self.species, self.age, self.food = arrays
+
+        if owner:
+            weakref.finalize(self, _unlink, list(self._blocks))
+
+    def get_shared_names(self):
+        """Retorna os nomes dos blocos de species, age e food."""
+        return tuple(block.name for block in self._blocks)
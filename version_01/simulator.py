@@ -1,12 +1,32 @@
 from field import Field
-from simulator_view import SimulatorView
+from array_field import ArrayField
+from chunked_field import ChunkedField
+from step_kernels import VectorizedStepper
+from tiled_stepper import TiledStepper
+from shared_array_field import SharedArrayField
+from observers import LoggerObserver, ViewObserver
+from field_stats import FieldStats
 from randomizer import Randomizer
+from checkpoint import save_checkpoint, load_checkpoint
+from phase_timer import PhaseTimer
 from rabbit import Rabbit
 from fox import Fox
-from location import Location
+from counter_random import stream_key, counter_uniform, counter_integers
+import numpy as np
 import time
 
 # simulator.py
+
+# Os modos de execução e os argumentos de Simulator de cada um (usados
+# pela linha de comando e pelo benchmark)
+MODES = {
+    'classic': {},
+    'array': {'field_class': ArrayField},
+    'vectorized': {'vectorized': True},
+    'chunked': {'field_class': ChunkedField}
+}
+
+
 class Simulator:
     """
     Um simulador simples predador-presa, baseado em um campo retangular
@@ -18,10 +38,32 @@ class Simulator:
     DEFAULT_DEPTH = 80    # A profundidade padrão da grade
     FOX_CREATION_PROBABILITY = 0.2      # A probabilidade de uma raposa ser criada
     RABBIT_CREATION_PROBABILITY = 0.08   # A probabilidade de um coelho ser criado
+    STEP_DELAY = 100   # A pausa entre passos, em milissegundos
+    # Se True, o campo inicial é sorteado com operações de array de uma vez
+    # (mesma distribuição, mas outra sequência de sorteios que o laço)
+    BULK_POPULATE = False
 
-    def __init__(self, depth=None, width=None):
+    def __init__(self, depth=None, width=None, field_class=None, vectorized=False,
+                 observers=None, headless=False, async_render=False, processes=None):
         """
         Cria um campo de simulação com o tamanho dado.
+        :param field_class: A implementação de campo a usar (Field,
+                            ArrayField ou, para mundos enormes e pouco
+                            povoados, ChunkedField); por padrão, Field
+        :param vectorized: Se True, cada passo é calculado para todos os
+                           animais de uma vez (exige um ArrayField, que
+                           passa a ser o padrão)
+        :param observers: Os observadores avisados a cada passo; por padrão,
+                          um LoggerObserver e um ViewObserver com uma
+                          SimulatorView
+        :param headless: Se True, não há observadores padrão (nem
+                         SimulatorView) e os passos não são pausados
+        :param async_render: Se True, a SimulatorView padrão desenha os
+                             gráficos em um processo separado
+        :param processes: Com vectorized, divide o campo em faixas
+                          calculadas por esse número de processos
+                          (TiledStepper); o campo padrão passa a ser um
+                          SharedArrayField
         """
         if depth is None:
             depth = self.DEFAULT_DEPTH
@@ -34,10 +76,41 @@ class Simulator:
             depth = self.DEFAULT_DEPTH
             width = self.DEFAULT_WIDTH
 
-        self.field = Field(depth, width)
-        self.view = SimulatorView(depth, width)
+        self.stepper = None
+        if vectorized and processes is not None:
+            self.stepper = TiledStepper(processes=processes)
+            if field_class is None:
+                field_class = SharedArrayField if processes > 1 else ArrayField
+        elif vectorized:
+            self.stepper = VectorizedStepper()
+            if field_class is None:
+                field_class = ArrayField
+        if field_class is None:
+            field_class = Field
+        if self.stepper is not None and not issubclass(field_class, ArrayField):
+            raise ValueError(f"vectorized exige um ArrayField, e não {field_class.__name__}")
+
+        self.field_class = field_class
+        self.field = field_class(depth, width)
+        # Segundo campo, reaproveitado como próximo estado a cada passo
+        self._spare_field = None
         self.step = 0
 
+        self.view = None
+        self.delay = self.STEP_DELAY
+        if headless:
+            self.delay = 0
+            if observers is None:
+                observers = []
+        elif observers is None:
+            # Importada só aqui: carrega matplotlib e IPython ao desenhar
+            from simulator_view import SimulatorView
+            self.view = SimulatorView(depth, width, async_render)
+            observers = [LoggerObserver(), ViewObserver(self.view)]
+        self.observers = list(observers)
+        # Cronômetro das fases de cada passo; None (desligado) por padrão
+        self.phase_timer = None
+
         self.reset()
 
     def run_long_simulation(self):
@@ -50,69 +123,245 @@ class Simulator:
     def simulate(self, num_steps):
         """
         Executa a simulação pelo número dado de passos.
-        Para antes do número dado de passos se deixar de ser viável.
+        Para antes do número dado de passos se deixar de ser viável ou se
+        algum observador pedir (ver SteadyStateDetector).
         """
-        self.report_stats()
         for n in range(1, num_steps + 1):
-            if not self.field.is_viable():
+            if not self.field.is_viable() or self._stop_requested():
                 break
             self.simulate_one_step()
-            self._delay(100)  # ajuste isto para mudar a velocidade de execução
+            if self.delay > 0:
+                self._delay(self.delay)  # ajuste self.delay para mudar a velocidade de execução
 
     def simulate_one_step(self):
         """
         Executa a simulação a partir de seu estado atual por um único passo.
         Itera sobre todo o campo atualizando o estado de cada raposa e coelho.
         """
+        timer = self.phase_timer
         self.step += 1
         # Usa um Field separado para armazenar o estado inicial do próximo passo
-        next_field_state = Field(self.field.get_depth(), self.field.get_width())
+        if timer is not None:
+            started = timer.start()
+        next_field_state = self._get_spare_field()
+        if timer is not None:
+            timer.stop('spare_field', started)
 
-        rabbits = self.field.get_rabbits()
-        foxes = self.field.get_foxes()
+        if self.stepper is not None:
+            # Todos os coelhos e depois todas as raposas, de uma só vez
+            if timer is not None:
+                started = timer.start()
+            self.stepper.step(self.field, next_field_state)
+            if timer is not None:
+                timer.stop('vectorized_step', started,
+                           self.field.stats.get_count(Rabbit) + self.field.stats.get_count(Fox))
+        else:
+            rabbits = self.field.get_rabbits()
+            foxes = self.field.get_foxes()
+            # Com o gerador por contador, cada animal sorteia do seu fluxo
+            keyed = Randomizer.COUNTER_BASED
 
-        # Deixa todos os coelhos correrem
-        for rabbit in rabbits:
-            rabbit.run(self.field, next_field_state)
+            # Deixa todos os coelhos correrem
+            if timer is not None:
+                started = timer.start()
+            for rabbit in rabbits:
+                if keyed and rabbit.is_alive():
+                    Randomizer.set_stream(self.step, rabbit.cell)
+                rabbit.run(self.field, next_field_state)
+            if timer is not None:
+                timer.stop('rabbits', started, len(rabbits))
 
-        # Deixa todas as raposas caçarem
-        for fox in foxes:
-            fox.hunt(self.field, next_field_state)
+            # Deixa todas as raposas caçarem
+            if timer is not None:
+                started = timer.start()
+            for fox in foxes:
+                if keyed and fox.is_alive():
+                    Randomizer.set_stream(self.step, fox.cell)
+                fox.hunt(self.field, next_field_state)
+            if timer is not None:
+                timer.stop('foxes', started, len(foxes))
 
-        # Substitui o estado antigo pelo novo
+        # Substitui o estado antigo pelo novo; o antigo será reaproveitado
+        self._spare_field = self.field
         self.field = next_field_state
+        if FieldStats.DEBUG:
+            self.field.stats.check_counts(self.field)
 
-        self.report_stats()
-        self.view.show_status(self.step, self.field)
+        self._notify_observers()
+        if timer is not None:
+            timer.end_step(self.step)
 
     def reset(self):
         """Redefine a simulação para uma posição inicial."""
         self.step = 0
         self._populate()
-        self.view.show_status(self.step, self.field)
+        self._notify_observers()
+
+    def add_observer(self, observer):
+        """Registra um observador para ser avisado a cada passo."""
+        self.observers.append(observer)
+
+    def remove_observer(self, observer):
+        """Remove um observador registrado."""
+        self.observers.remove(observer)
+
+    def enable_phase_timing(self, window=100, callback=None):
+        """
+        Liga a medição do tempo de cada fase dos passos (veja PhaseTimer).
+        :param window: De quantos em quantos passos o relatório é gerado
+        :param callback: Função chamada com (step, relatório); por exemplo,
+                         phase_timer.print_report
+        :return: O PhaseTimer, cujo get_report dá o último relatório
+        """
+        self.phase_timer = PhaseTimer(window, callback)
+        return self.phase_timer
+
+    def disable_phase_timing(self):
+        """Desliga a medição do tempo das fases."""
+        self.phase_timer = None
+
+    def close(self):
+        """
+        Encerra os observadores (por exemplo, espera o processo de
+        renderização da SimulatorView salvar os gráficos pendentes) e o
+        executor dos passos.
+        """
+        for observer in self.observers:
+            observer.close()
+        if self.stepper is not None:
+            self.stepper.close()
+
+    def save_checkpoint(self, path):
+        """Grava o estado completo da simulação (veja checkpoint.py)."""
+        save_checkpoint(self, path)
+
+    def load_checkpoint(self, path):
+        """Continua a simulação a partir de um checkpoint gravado antes."""
+        load_checkpoint(self, path)
+        self._spare_field = None
 
     def report_stats(self):
         """Relata o número de cada tipo de animal no campo."""
         print(f"Step: {self.step} ", end="")
         self.field.field_stats()
 
+    def _notify_observers(self):
+        """
+        Avisa os observadores interessados no passo atual. Com o cronômetro
+        de fases ligado, cada tipo de observador é uma fase.
+        """
+        timer = self.phase_timer
+        for observer in self.observers:
+            if observer.wants(self.step):
+                if timer is None:
+                    observer.on_step(self.step, self.field)
+                else:
+                    started = timer.start()
+                    observer.on_step(self.step, self.field)
+                    timer.stop(type(observer).__name__, started)
+
+    def _stop_requested(self):
+        """Verifica se algum observador pediu o fim da simulação."""
+        return any(observer.should_stop() for observer in self.observers)
+
+    def _get_spare_field(self):
+        """
+        Retorna um campo vazio para o próximo estado, reaproveitando o
+        campo do passo anterior em vez de criar um novo a cada passo.
+        """
+        spare = self._spare_field
+        if (spare is None or
+                spare.get_depth() != self.field.get_depth() or
+                spare.get_width() != self.field.get_width()):
+            spare = self.field_class(self.field.get_depth(), self.field.get_width())
+        else:
+            spare.clear()
+        self._spare_field = None
+        return spare
+
     def _populate(self):
         """Popula aleatoriamente o campo com raposas e coelhos."""
+        if isinstance(self.field, ChunkedField):
+            self._populate_sparse()
+            return
+        if self.BULK_POPULATE:
+            self._populate_bulk()
+            return
+
         rand = Randomizer.get_random()
+        keyed = Randomizer.COUNTER_BASED
         self.field.clear()
 
         for row in range(self.field.get_depth()):
             for col in range(self.field.get_width()):
+                if keyed:
+                    Randomizer.set_stream(0, row * self.field.get_width() + col)
                 if rand.random() <= self.FOX_CREATION_PROBABILITY:
-                    location = Location(row, col)
+                    location = self.field.location_at(row, col)
                     fox = Fox(True, location)
                     self.field.place_fox(fox, location)
                 elif rand.random() <= self.RABBIT_CREATION_PROBABILITY:
-                    location = Location(row, col)
+                    location = self.field.location_at(row, col)
                     rabbit = Rabbit(True, location)
                     self.field.place_rabbit(rabbit, location)
                 # senão deixa a localização vazia
 
+    def _populate_bulk(self):
+        """
+        Popula o campo como _populate, mas sorteando as espécies, idades e
+        níveis de comida de todas as células de uma vez e carregando tudo
+        no campo com import_population. Cada célula recebe uma raposa com
+        probabilidade FOX_CREATION_PROBABILITY; senão, um coelho com
+        probabilidade RABBIT_CREATION_PROBABILITY.
+        """
+        size = self.field.get_depth() * self.field.get_width()
+        cells = np.arange(size)
+        if Randomizer.COUNTER_BASED:
+            # Sorteios de cada célula, como os de set_stream(0, célula)
+            key = stream_key(Randomizer.SEED, 0)
+            uniform = lambda ids, stream: counter_uniform(key, ids, stream)
+            integers = lambda ids, stream, low, high: counter_integers(key, ids, stream, low, high)
+        else:
+            # Semente tirada do gerador compartilhado: cada reset sorteia outro campo
+            rng = np.random.default_rng(int(Randomizer.get_random().random() * (1 << 53)))
+            uniform = lambda ids, stream: rng.random(len(ids))
+            integers = lambda ids, stream, low, high: rng.integers(low, high, len(ids))
+
+        is_fox = uniform(cells, 1) <= self.FOX_CREATION_PROBABILITY
+        is_rabbit = ~is_fox & (uniform(cells, 2) <= self.RABBIT_CREATION_PROBABILITY)
+        fox_cells = cells[is_fox]
+        rabbit_cells = cells[is_rabbit]
+
+        self.field.import_population(
+            rabbit_cells, integers(rabbit_cells, 3, 0, Rabbit.MAX_AGE),
+            fox_cells, integers(fox_cells, 4, 0, Fox.MAX_AGE),
+            integers(fox_cells, 5, 0, Fox.RABBIT_FOOD_VALUE))
+
+    def _populate_sparse(self):
+        """
+        Popula um campo enorme e pouco povoado (ChunkedField) sem percorrer
+        as células: sorteia quantas raposas e coelhos haverá (com a mesma
+        distribuição que _populate) e depois células distintas para eles.
+        O custo é proporcional à população, não à área.
+        """
+        size = self.field.get_depth() * self.field.get_width()
+        if Randomizer.COUNTER_BASED:
+            # O campo inicial depende só da semente
+            rng = np.random.default_rng(stream_key(Randomizer.SEED, 0))
+        else:
+            rng = np.random.default_rng(int(Randomizer.get_random().random() * (1 << 53)))
+
+        num_foxes = int(rng.binomial(size, self.FOX_CREATION_PROBABILITY))
+        num_rabbits = int(rng.binomial(size - num_foxes, self.RABBIT_CREATION_PROBABILITY))
+        cells = rng.choice(size, num_foxes + num_rabbits, replace=False)
+        fox_cells = np.sort(cells[:num_foxes])
+        rabbit_cells = np.sort(cells[num_foxes:])
+
+        self.field.import_population(
+            rabbit_cells, rng.integers(0, Rabbit.MAX_AGE, num_rabbits),
+            fox_cells, rng.integers(0, Fox.MAX_AGE, num_foxes),
+            rng.integers(0, Fox.RABBIT_FOOD_VALUE, num_foxes))
+
     def _delay(self, milliseconds):
         """
         Pausa por um tempo dado.
@@ -166,4 +415,5 @@ if __name__ == "__main__":
         except Exception as e:
             print(f"Erro: {e}")
 
+    simulator.close()
     print("Simulação finalizada.")
@@ -1,22 +1,32 @@
 #simulator_view.py
-import matplotlib.pyplot as plt
-from matplotlib.colors import ListedColormap
 import numpy as np
 import os
 from field_stats import FieldStats
-from location import Location
-from IPython.display import display, HTML, Image
+from rabbit import Rabbit
+from fox import Fox
+from plot_renderer import PlotRenderer, GRID_COLORS, MAX_DISPLAY_ROWS, MAX_DISPLAY_COLS
+from render_worker import RenderWorker
+
+# matplotlib e IPython são importados só quando algo é desenhado ou
+# exibido: criar a visualização (ou importar o simulator) não os carrega
 
 
 class SimulatorView:
     """
     Uma visualização gráfica da grade de simulação para Google Colab.
     Não interfere com o input do usuário.
+
+    O diretório de imagens e a área de visualização só são criados quando
+    o primeiro gráfico é salvo.
     """
 
-    def __init__(self, height, width):
+    def __init__(self, height, width, async_render=False, history_window=10000):
         """
         Cria uma visualização com a altura e largura dadas.
+        :param async_render: Se True, os gráficos são desenhados e salvos
+                             por um processo separado (RenderWorker)
+        :param history_window: Quantos passos recentes o histórico de
+                               populações guarda (None para todos)
         """
         self.height = height
         self.width = width
@@ -29,9 +39,6 @@ class SimulatorView:
             'Empty': 0    # Branco/Transparente
         }
 
-        # Configuração do matplotlib
-        self.colormap = ListedColormap(['white', 'lightgreen', 'red'])
-
         # Histórico de populações para gráficos
         self.population_history = {
             'steps': [],
@@ -39,20 +46,30 @@ class SimulatorView:
             'foxes': [],
             'total': []
         }
+        self.history_window = history_window
 
         # Controla frequência de atualização
         self.update_frequency = 25  # Atualiza gráfico a cada 25 steps
         self.print_frequency = 50   # Imprime info a cada 50 steps
 
-        # Configuração do matplotlib para não interferir com input
-        plt.ioff()  # Desativa modo interativo
-
-        # Cria diretório para salvar imagens
+        # Diretório para salvar imagens, criado no primeiro gráfico
         self.image_dir = "simulation_images"
-        self.setup_image_directory()
+        self._output_ready = False
 
-        # Cria área de visualização dedicada
-        self.setup_display_area()
+        # Figura reaproveitada entre os gráficos salvos
+        self.renderer = PlotRenderer()
+
+        # Processo de renderização em segundo plano (opcional), iniciado no
+        # primeiro gráfico
+        self.async_render = async_render
+        self.render_worker = None
+        self._sent_index = 0  # Pontos do histórico já enviados ao worker
+
+    @property
+    def colormap(self):
+        """O mapa de cores da grade (carrega o matplotlib na primeira vez)."""
+        from matplotlib.colors import ListedColormap
+        return ListedColormap(GRID_COLORS)
 
     def setup_image_directory(self):
         """Cria diretório para salvar as imagens da simulação."""
@@ -70,6 +87,7 @@ class SimulatorView:
     def setup_display_area(self):
         """Configura área dedicada para visualização."""
         try:
+            from IPython.display import display, HTML
             display(HTML("""
             <div id="simulation-display" style="margin: 20px 0; padding: 10px; border: 1px solid #ddd; border-radius: 5px;">
                 <h3>🐰🦊 Simulação Predador-Presa</h3>
@@ -101,32 +119,17 @@ class SimulatorView:
         """
         Mostra o status atual do campo.
         """
-        # Sempre atualiza as estatísticas
-        self.stats.reset()
-
-        # Conta populações
-        rabbit_count = 0
-        fox_count = 0
-
-        for row in range(field.get_depth()):
-            for col in range(field.get_width()):
-                animal = field.get_object_at(Location(row, col))
-                if animal is not None:
-                    self.stats.increment_count(type(animal))
-                    animal_type = type(animal).__name__
-
-                    if animal_type == 'Rabbit':
-                        rabbit_count += 1
-                    elif animal_type == 'Fox':
-                        fox_count += 1
-
-        self.stats.count_finished()
+        # O campo mantém suas próprias contagens atualizadas
+        self.stats = field.stats
+        rabbit_count = self.stats.get_count(Rabbit)
+        fox_count = self.stats.get_count(Fox)
 
         # Sempre adiciona ao histórico
         self.population_history['steps'].append(step)
         self.population_history['rabbits'].append(rabbit_count)
         self.population_history['foxes'].append(fox_count)
         self.population_history['total'].append(rabbit_count + fox_count)
+        self._trim_history()
 
         # Imprime informações de forma compacta
         if step % self.print_frequency == 0:
@@ -134,104 +137,112 @@ class SimulatorView:
 
         # Atualiza gráficos periodicamente
         if step % self.update_frequency == 0:
-            self.create_and_save_plots(field, step, rabbit_count, fox_count)
+            if self.async_render:
+                self.submit_plots(field, step, rabbit_count, fox_count)
+            else:
+                self.create_and_save_plots(field, step, rabbit_count, fox_count)
+
+        if self.render_worker is not None:
+            self.display_rendered_images()
+
+    def submit_plots(self, field, step, rabbit_count, fox_count):
+        """
+        Envia ao processo de renderização uma amostra da grade e os pontos
+        do histórico ainda não enviados. Não espera o gráfico ser salvo.
+        """
+        self._prepare_output()
+        if self.render_worker is None:
+            self.render_worker = RenderWorker(self.image_dir, history_window=self.history_window)
+        start = self._sent_index
+        self._sent_index = len(self.population_history['steps'])
+        history = {key: self.population_history[key][start:]
+                   for key in ('steps', 'rabbits', 'foxes')}
+        self.render_worker.submit({
+            'step': step,
+            'grid': self._grid_snapshot(field),
+            'depth': field.get_depth(),
+            'width': field.get_width(),
+            'rabbits': rabbit_count,
+            'foxes': fox_count,
+            'history': history
+        })
+
+    def display_rendered_images(self):
+        """Exibe as imagens que o processo de renderização já salvou."""
+        for filename in self.render_worker.completed():
+            print(f"💾 Gráfico salvo: {filename}")
+            try:
+                from IPython.display import display, Image
+                display(Image(filename))
+            except Exception:
+                pass
+
+    def close(self):
+        """
+        Fecha a figura e encerra o processo de renderização, esperando os
+        gráficos pendentes.
+        """
+        self.renderer.close()
+        if self.render_worker is not None:
+            self.render_worker.close()
+            self.display_rendered_images()
+            if self.render_worker.dropped > 0:
+                print(f"⏭️  {self.render_worker.dropped} gráficos descartados para não atrasar a simulação")
+            self.render_worker = None
+
+    def _prepare_output(self):
+        """
+        Cria o diretório de imagens e a área de visualização, na primeira
+        vez em que um gráfico vai ser salvo.
+        """
+        if self._output_ready:
+            return
+        self._output_ready = True
+        self.setup_image_directory()
+        self.setup_display_area()
+
+    def _trim_history(self):
+        """
+        Mantém só os últimos history_window passos do histórico. O corte é
+        feito quando o histórico chega ao dobro da janela, para que o custo
+        de apagar o início das listas fique diluído entre os passos.
+        """
+        if self.history_window is None:
+            return
+        excess = len(self.population_history['steps']) - self.history_window
+        if excess < self.history_window:
+            return
+        for values in self.population_history.values():
+            del values[:excess]
+        self._sent_index = max(0, self._sent_index - excess)
+
+    def _grid_snapshot(self, field):
+        """
+        Retorna a amostra da grade mostrada no gráfico, com os códigos
+        0 = vazio, 1 = coelho e 2 = raposa. Só a região mostrada é pedida
+        ao campo.
+        """
+        return np.ascontiguousarray(field.snapshot(MAX_DISPLAY_ROWS, MAX_DISPLAY_COLS))
 
     def create_and_save_plots(self, field, step, rabbit_count, fox_count):
         """Cria e salva gráficos da simulação."""
 
+        self._prepare_output()
         try:
-            # Cria figura
-            fig, axes = plt.subplots(1, 2, figsize=(15, 6))
-            fig.patch.set_facecolor('white')
-            fig.suptitle(f"Simulação Predador-Presa - Step {step}", fontsize=16, fontweight='bold')
-
-            # Plot 1: Grade do campo (amostra)
-            grid_matrix = np.zeros((field.get_depth(), field.get_width()))
-
-            for row in range(field.get_depth()):
-                for col in range(field.get_width()):
-                    animal = field.get_object_at(Location(row, col))
-                    if animal is not None:
-                        animal_type = type(animal).__name__
-                        if animal_type == 'Rabbit':
-                            grid_matrix[row][col] = 1
-                        elif animal_type == 'Fox':
-                            grid_matrix[row][col] = 2
-
-            # Mostra amostra do campo (limitado para visualização)
-            max_rows = min(40, field.get_depth())
-            max_cols = min(60, field.get_width())
-            display_grid = grid_matrix[:max_rows, :max_cols]
-
-            im = axes[0].imshow(display_grid, cmap=self.colormap, vmin=0, vmax=2, aspect='equal')
-            axes[0].set_title(f"Campo - Step {step}\n Coelhos: {rabbit_count} |  Raposas: {fox_count}")
-            axes[0].set_xlabel(f"Largura (mostrando {max_cols}/{field.get_width()})")
-            axes[0].set_ylabel(f"Altura (mostrando {max_rows}/{field.get_depth()})")
-
-            # Adiciona legenda de cores
-            legend_elements = [
-                plt.Rectangle((0,0),1,1, facecolor='lightgreen', label='Coelhos'),
-                plt.Rectangle((0,0),1,1, facecolor='red', label='Raposas'),
-                plt.Rectangle((0,0),1,1, facecolor='white', edgecolor='black', label='Vazio')
-            ]
-            axes[0].legend(handles=legend_elements, loc='upper right', bbox_to_anchor=(1.0, 1.0))
-
-            # Adiciona info se o campo foi truncado
-            if field.get_depth() > max_rows or field.get_width() > max_cols:
-                axes[0].text(0.02, 0.02, f"Amostra: {max_rows}×{max_cols}\nCampo real: {field.get_depth()}×{field.get_width()}",
-                            transform=axes[0].transAxes,
-                            verticalalignment='bottom',
-                            fontsize=8,
-                            bbox=dict(boxstyle="round,pad=0.3", facecolor="yellow", alpha=0.7))
-
-            # Plot 2: Evolução populacional
-            if len(self.population_history['steps']) > 1:
-                axes[1].plot(self.population_history['steps'],
-                           self.population_history['rabbits'],
-                           'g-', label='Coelhos', linewidth=2.5, marker='o', markersize=3)
-                axes[1].plot(self.population_history['steps'],
-                           self.population_history['foxes'],
-                           'r-', label='Raposas', linewidth=2.5, marker='s', markersize=3)
-
-                # Destaca ponto atual com marcadores maiores
-                axes[1].plot(step, rabbit_count, 'go', markersize=8, markeredgecolor='darkgreen', markeredgewidth=2)
-                axes[1].plot(step, fox_count, 'ro', markersize=8, markeredgecolor='darkred', markeredgewidth=2)
-
-                # Adiciona texto com valores atuais
-                axes[1].text(0.02, 0.98, f"Atual:\n Coelhos {rabbit_count}\nRaposas {fox_count}",
-                           transform=axes[1].transAxes,
-                           verticalalignment='top',
-                           fontsize=10,
-                           bbox=dict(boxstyle="round,pad=0.3", facecolor="lightblue", alpha=0.8))
-
-            axes[1].set_title("Evolução Populacional")
-            axes[1].set_xlabel("Steps")
-            axes[1].set_ylabel("População")
-            axes[1].legend(loc='upper right')
-            axes[1].grid(True, alpha=0.3)
-
-            # Define limites do eixo y para melhor visualização
-            if len(self.population_history['steps']) > 1:
-                max_pop = max(max(self.population_history['rabbits']), max(self.population_history['foxes']))
-                axes[1].set_ylim(0, max_pop * 1.1)
-
-            plt.tight_layout()
-
-            # Salva a imagem
             filename = f"{self.image_dir}/simulation_step_{step:06d}.png"
-            plt.savefig(filename, dpi=150, bbox_inches='tight', facecolor='white')
+            self.renderer.render(self._grid_snapshot(field), field.get_depth(), field.get_width(),
+                                 step, rabbit_count, fox_count, self.population_history, filename)
 
             print(f"💾 Gráfico salvo: {filename}")
 
             # Exibe a imagem se estivermos no Colab/Jupyter
             try:
+                from IPython.display import display, Image
                 display(Image(filename))
             except Exception:
                 # Se não conseguir exibir, pelo menos confirma que salvou
                 print(f"📊 Gráfico do Step {step} salvo com sucesso!")
 
-            plt.close(fig)  # Fecha para liberar memória
-
         except Exception as e:
             print(f"❌ Erro ao criar/salvar gráfico do Step {step}: {e}")
             # Tenta criar pelo menos um gráfico simples
@@ -240,6 +251,7 @@ class SimulatorView:
     def create_simple_plot_fallback(self, step, rabbit_count, fox_count):
         """Cria um gráfico simples como fallback em caso de erro."""
         try:
+            import matplotlib.pyplot as plt
             fig, ax = plt.subplots(1, 1, figsize=(10, 6))
 
             if len(self.population_history['steps']) > 1:
@@ -320,7 +332,9 @@ class SimulatorView:
 
     def create_final_summary_plot(self):
         """Cria gráfico final resumo da simulação."""
+        self._prepare_output()
         try:
+            import matplotlib.pyplot as plt
             fig, ax = plt.subplots(1, 1, figsize=(14, 8))
             fig.patch.set_facecolor('white')
 
@@ -360,6 +374,7 @@ class SimulatorView:
 
             # Tenta exibir
             try:
+                from IPython.display import display, Image
                 display(Image(final_filename))
                 plt.show()
             except:
@@ -0,0 +1,420 @@
+# step_kernels.py
+import numpy as np
+from array_field import ArrayField
+from randomizer import Randomizer
+from rabbit import Rabbit
+from fox import Fox
+from neighbor_index import OFFSETS
+from counter_random import stream_key, counter_uniform, counter_integers
+
+# Passos usados para percorrer os vizinhos em ordem pseudoaleatória:
+# (inicio + k * passo) % 8 visita as oito direções para qualquer passo ímpar
+_STRIDES = np.array([1, 3, 5, 7])
+
+# Deslocamento de linha e de coluna de cada direção de OFFSETS
+_ROW_OFFSETS = np.array([roffset for roffset, _ in OFFSETS], dtype=np.int64)
+_COL_OFFSETS = np.array([coffset for _, coffset in OFFSETS], dtype=np.int64)
+# Para cada borda da grade, os bits das direções que saem por ela
+_TOP_BITS = sum(1 << k for k, (roffset, _) in enumerate(OFFSETS) if roffset < 0)
+_BOTTOM_BITS = sum(1 << k for k, (roffset, _) in enumerate(OFFSETS) if roffset > 0)
+_LEFT_BITS = sum(1 << k for k, (_, coffset) in enumerate(OFFSETS) if coffset < 0)
+_RIGHT_BITS = sum(1 << k for k, (_, coffset) in enumerate(OFFSETS) if coffset > 0)
+# As oito direções cabem em (e são sorteadas como) um índice de 3 bits
+_DIRECTION_MASK = len(OFFSETS) - 1
+
+# Valor de prioridade que indica uma célula ainda não disputada
+_NO_OWNER = np.iinfo(np.int64).max
+
+# Valores do mapa de destinos dos coelhos (além das células de destino):
+# célula sem coelho vivo e célula de um coelho que ainda não agiu
+NO_RABBIT = -1
+PENDING = -2
+
+# Fluxos dos sorteios por contador: cada finalidade usa um fluxo próprio
+_STREAM_BREED = 1
+_STREAM_LITTER = 2
+_STREAM_FOOD = 3
+_STREAM_CLAIM = 10   # + 0 (início), 1 (passo) e 2 (prioridade)
+_STREAM_HUNT = 20
+
+
+class VectorizedStepper:
+    """
+    Executa um passo da simulação sobre um ArrayField inteiro de uma vez,
+    com operações de array no lugar das chamadas Rabbit.run e Fox.hunt
+    feitas animal por animal.
+
+    As regras são as mesmas das classes Rabbit e Fox (envelhecer, procriar,
+    mover, comer e morrer), lendo as constantes dessas classes. Como todos
+    os animais de uma espécie agem ao mesmo tempo, dois animais podem
+    escolher a mesma célula livre; o conflito é resolvido por uma ordem de
+    prioridade sorteada a cada passo (vence o animal com o menor valor de
+    prioridade e o perdedor tenta o próximo vizinho da sua lista). Com a
+    mesma semente, o resultado é sempre o mesmo.
+
+    Com counter_based, cada sorteio é uma função da semente, do número do
+    passo, da célula do animal e da finalidade do sorteio (veja
+    counter_random), em vez de vir de um gerador sequencial: os sorteios de
+    um animal não dependem de quantos outros animais agem antes dele nem
+    de como o campo é dividido entre processos.
+    """
+
+    def __init__(self, seed=None, counter_based=None):
+        """
+        Cria o executor com seu próprio gerador aleatório do NumPy.
+        :param seed: A semente; por padrão, Randomizer.SEED
+        :param counter_based: Se os sorteios são por contador; por padrão,
+                              Randomizer.COUNTER_BASED
+        """
+        if seed is None:
+            seed = Randomizer.SEED
+        if counter_based is None:
+            counter_based = Randomizer.COUNTER_BASED
+        self.seed = seed
+        self.counter_based = counter_based
+        self.step_count = 0  # Passos calculados; parte da chave por contador
+        self._key = None     # Chave dos sorteios por contador do passo atual
+        self.rng = np.random.default_rng(seed)
+        self._owner = np.empty(0, dtype=np.int64)
+        self._dest_map = np.empty(0, dtype=np.int64)
+        # Arrays reaproveitados de um passo para o outro (ver _buffer)
+        self._buffers = {}
+
+    def step(self, field, next_field_state):
+        """
+        Calcula em next_field_state o estado seguinte de field:
+        primeiro todos os coelhos, depois todas as raposas.
+        """
+        self.start_step(self.step_count + 1)
+        size = len(field.species)
+        if len(self._dest_map) != size:
+            self._dest_map = np.empty(size, dtype=np.int64)
+        self._dest_map.fill(NO_RABBIT)
+        self.step_region(field, next_field_state, 0, size, self._dest_map)
+        next_field_state.refresh_stats()
+
+    def close(self):
+        """Libera recursos do executor (nenhum, neste caso)."""
+        pass
+
+    def start_step(self, step_count):
+        """Define o número do passo (e a chave dos sorteios por contador)."""
+        self.step_count = step_count
+        if self.counter_based:
+            self._key = stream_key(self.seed, step_count)
+
+    def step_region(self, field, next_field_state, low, high, dest_map):
+        """
+        Calcula o próximo estado dos animais das células [low, high):
+        primeiro os coelhos, depois as raposas. As leituras e escritas no
+        próximo estado ficam a no máximo uma linha da região.
+        :param dest_map: Para cada célula do estado atual, o destino do
+                         coelho que estava nela, NO_RABBIT ou PENDING (um
+                         coelho de outra região que ainda não agiu)
+        """
+        shape = (field.get_depth(), field.get_width())
+        width = shape[1]
+        window = (max(0, low - width), min(len(field.species), high + width))
+        rabbit_cells = low + np.flatnonzero(field.species[low:high] == ArrayField.RABBIT)
+        dest_map[rabbit_cells] = self.step_rabbits(field, next_field_state, shape,
+                                                   rabbit_cells, window)
+        fox_cells = low + np.flatnonzero(field.species[low:high] == ArrayField.FOX)
+        self.step_foxes(field, next_field_state, shape, fox_cells, window, dest_map)
+
+    def step_rabbits(self, field, next_field_state, shape, cells, window):
+        """
+        Envelhece, reproduz e move os coelhos das células dadas.
+        :param shape: A tupla (depth, width) da grade
+        :param window: O intervalo de células do próximo estado que eles
+                       podem alcançar
+        :return: A célula de destino de cada um no próximo estado (-1 se
+                 morreu)
+        """
+        dest = np.full(len(cells), NO_RABBIT, dtype=np.int64)
+
+        age = field.age[cells].astype(np.int64) + 1
+        alive = np.flatnonzero(age <= Rabbit.MAX_AGE)
+        births = self._draw_births(cells[alive], age[alive], Rabbit)
+
+        claims, got = self._claim_free_cells(cells[alive], births + 1, shape,
+                                             next_field_state.species, window)
+        young, survivors = self._split_claims(claims, got, births)
+        self._place(next_field_state, ArrayField.RABBIT, young, 0, 0)
+
+        moved = claims[survivors, births[survivors]]
+        self._place(next_field_state, ArrayField.RABBIT, moved,
+                    age[alive[survivors]], 0)
+        dest[alive[survivors]] = moved
+        return dest
+
+    def step_foxes(self, field, next_field_state, shape, cells, window, dest_map):
+        """
+        Envelhece, alimenta, reproduz e move as raposas das células dadas.
+        As raposas caçam os coelhos do estado atual que sobreviveram ao
+        passo dos coelhos (ou que ainda não agiram); um coelho comido é
+        retirado de onde foi parar no próximo estado (ou, se ainda não
+        agiu, do estado atual) e a raposa ocupa a posição antiga dele.
+        """
+        age = field.age[cells].astype(np.int64) + 1
+        food = field.food[cells].astype(np.int64) - 1
+        alive = (age <= Fox.MAX_AGE) & (food > 0)
+        cells, age, food = cells[alive], age[alive], food[alive]
+        births = self._draw_births(cells, age, Fox)
+
+        # Caça: presas são os coelhos vivos no estado atual
+        low, high = window
+        prey = self._buffer('prey', high - low + 1, bool)
+        np.not_equal(dest_map[low:high], NO_RABBIT, out=prey[:-1])
+        prey[-1] = False
+        meal = self._hunt(cells, shape, prey, low)
+        ate = meal >= 0
+        food[ate] = Fox.RABBIT_FOOD_VALUE
+
+        # Remove os coelhos comidos de onde eles foram parar
+        eaten = meal[ate]
+        eaten_dest = dest_map[eaten]
+        next_field_state.species[eaten_dest[eaten_dest >= 0]] = ArrayField.EMPTY
+        field.species[eaten[eaten_dest == PENDING]] = ArrayField.EMPTY
+        dest_map[eaten] = NO_RABBIT
+
+        # Raposas que comeram ocupam a posição da presa
+        self._place(next_field_state, ArrayField.FOX, meal[ate], age[ate], food[ate])
+        self._forget_overwritten(shape, meal[ate], dest_map)
+
+        # Filhotes e raposas que não comeram disputam as células livres
+        demand = births + np.where(ate, 0, 1)
+        claims, got = self._claim_free_cells(cells, demand, shape,
+                                             next_field_state.species, window)
+        young, survivors = self._split_claims(claims, got, births)
+        # Como em Fox.__init__, filhotes nascem com nível de comida aleatório
+        young_food = self._integers(young, _STREAM_FOOD, 0, Fox.RABBIT_FOOD_VALUE)
+        self._place(next_field_state, ArrayField.FOX, young, 0, young_food)
+        movers = survivors[~ate[survivors]]
+        self._place(next_field_state, ArrayField.FOX, claims[movers, births[movers]],
+                    age[movers], food[movers])
+
+    def _forget_overwritten(self, shape, cells, dest_map):
+        """
+        Um coelho que se moveu para uma célula onde uma raposa acabou de
+        ser colocada foi sobrescrito: deixa de constar no mapa de destinos,
+        para que nenhuma raposa de outra região o coma depois (o que
+        apagaria a raposa).
+        """
+        deltas, valid = self._directions(cells, shape)
+        inside = (valid[:, None] >> np.arange(len(OFFSETS))) & 1 == 1
+        sources = np.where(inside, cells[:, None] + deltas, 0)
+        moved_in = inside & (dest_map[sources] == cells[:, None])
+        dest_map[sources[moved_in]] = NO_RABBIT
+
+    def _draw_births(self, cells, age, animal_class):
+        """Sorteia o número de filhotes de cada animal, como em _breed."""
+        can_breed = age >= animal_class.BREEDING_AGE
+        breeds = can_breed & (self._uniform(cells, _STREAM_BREED) <= animal_class.BREEDING_PROBABILITY)
+        litter = self._integers(cells, _STREAM_LITTER, 1, animal_class.MAX_LITTER_SIZE + 1)
+        return np.where(breeds, litter, 0)
+
+    def _neighbor_order(self, sources, stream):
+        """
+        Sorteia, para cada animal, uma ordem de visita dos oito vizinhos:
+        uma direção inicial e um passo ímpar.
+        """
+        start = self._integers(sources, stream, 0, len(OFFSETS))
+        stride = _STRIDES[self._integers(sources, stream + 1, 0, len(_STRIDES))]
+        return start, stride
+
+    def _claim_free_cells(self, sources, demand, shape, species, window):
+        """
+        Cada animal, a partir da célula em sources, reserva até demand[i]
+        células vizinhas livres no próximo estado, percorrendo seus
+        vizinhos em ordem aleatória. Conflitos vão para o animal com o
+        menor valor de prioridade (sorteado); o perdedor segue para o
+        próximo vizinho.
+        As células reservadas são marcadas como ocupadas. Só o intervalo
+        window de species é consultado.
+        :return: As células reservadas por animal (n x 8, em ordem de
+                 reserva; só as got[i] primeiras da linha i são válidas) e
+                 quantas cada um conseguiu. O array é reaproveitado na
+                 próxima chamada
+        """
+        n = len(sources)
+        claims = self._buffer('claims', n * len(OFFSETS), np.int64).reshape(n, len(OFFSETS))
+        got = np.zeros(n, dtype=np.int64)
+        if n == 0:
+            return claims, got
+
+        priority = self._draw_priority(sources, _STREAM_CLAIM + 2)
+        start, stride = self._neighbor_order(sources, _STREAM_CLAIM)
+        deltas, valid = self._directions(sources, shape)
+        # Uma célula extra, sempre ocupada, recebe os vizinhos -1 (fora da grade)
+        low, high = window
+        occupied = self._buffer('occupied', high - low + 1, bool)
+        np.not_equal(species[low:high], ArrayField.EMPTY, out=occupied[:-1])
+        occupied[-1] = True
+
+        active = np.flatnonzero(demand > 0)
+        for k in range(len(OFFSETS)):
+            if len(active) == 0:
+                break
+            target = self._next_neighbor(sources, start, stride, deltas, valid, active, k)
+            free = ~occupied[self._local(target, low, len(occupied) - 1)]
+            winners, target = self._pick_winners(active[free], target[free], priority)
+
+            occupied[target - low] = True
+            claims[winners, got[winners]] = target
+            got[winners] += 1
+            active = active[got[active] < demand[active]]
+
+        return claims, got
+
+    def _hunt(self, sources, shape, prey, offset):
+        """
+        Cada raposa procura, em ordem aleatória, um coelho vivo adjacente.
+        Duas raposas que escolhem o mesmo coelho são resolvidas pela
+        prioridade sorteada. O array prey cobre linhas inteiras a partir da
+        célula offset (com uma célula extra, sempre falsa, para os vizinhos
+        -1) e é atualizado conforme os coelhos são comidos.
+        :return: A célula do coelho comido por cada raposa, ou -1
+        """
+        n = len(sources)
+        meal = np.full(n, -1, dtype=np.int64)
+        if n == 0:
+            return meal
+
+        priority = self._draw_priority(sources, _STREAM_HUNT + 2)
+        start, stride = self._neighbor_order(sources, _STREAM_HUNT)
+        deltas, valid = self._directions(sources, shape)
+
+        # Os coelhos só saem de prey: uma raposa sem nenhum coelho adjacente
+        # agora não come neste passo, e fica fora da busca
+        near = self._any_neighbor(prey[:-1], shape[1])
+        active = np.flatnonzero(near[sources - offset])
+        for k in range(len(OFFSETS)):
+            if len(active) == 0:
+                break
+            target = self._next_neighbor(sources, start, stride, deltas, valid, active, k)
+            hit = prey[self._local(target, offset, len(prey) - 1)]
+            winners, target = self._pick_winners(active[hit], target[hit], priority)
+
+            prey[target - offset] = False
+            meal[winners] = target
+            active = active[meal[active] < 0]
+
+        return meal
+
+    def _any_neighbor(self, mask, width):
+        """
+        Para cada célula de mask (linhas inteiras da grade, achatadas),
+        retorna se alguma das oito vizinhas é True.
+        """
+        grid = mask.reshape(-1, width)
+        rows = len(grid)
+        near = self._buffer('near', len(mask), bool).reshape(rows, width)
+        near.fill(False)
+        for roffset, coffset in OFFSETS:
+            near[max(0, -roffset):rows - max(0, roffset), max(0, -coffset):width - max(0, coffset)] |= \
+                grid[max(0, roffset):rows - max(0, -roffset), max(0, coffset):width - max(0, -coffset)]
+        return near.ravel()
+
+    def _directions(self, sources, shape):
+        """
+        Prepara o cálculo dos vizinhos sem consultar uma tabela: o vizinho
+        na direção d de uma célula é célula + deltas[d], se o bit d de
+        valid for 1 (o vizinho está dentro da grade).
+        :return: A tupla (deltas, um por direção; valid, um por animal)
+        """
+        depth, width = shape
+        deltas = _ROW_OFFSETS * width + _COL_OFFSETS
+        rows = sources // width
+        cols = sources - rows * width
+        valid = np.full(len(sources), (1 << len(OFFSETS)) - 1, dtype=np.int64)
+        valid[rows == 0] &= ~_TOP_BITS
+        valid[rows == depth - 1] &= ~_BOTTOM_BITS
+        valid[cols == 0] &= ~_LEFT_BITS
+        valid[cols == width - 1] &= ~_RIGHT_BITS
+        return deltas, valid
+
+    def _next_neighbor(self, sources, start, stride, deltas, valid, active, k):
+        """
+        Retorna o k-ésimo vizinho, na ordem sorteada, dos animais ativos
+        (-1 se cair fora da grade).
+        """
+        direction = (start[active] + k * stride[active]) & _DIRECTION_MASK
+        inside = (valid[active] >> direction) & 1 == 1
+        return np.where(inside, sources[active] + deltas[direction], -1)
+
+    def _local(self, target, offset, sentinel):
+        """
+        Converte células em posições de um array que começa em offset; os
+        vizinhos -1 (fora da grade) vão para a posição sentinel.
+        """
+        return np.where(target >= 0, target - offset, sentinel)
+
+    def _draw_priority(self, sources, stream):
+        """
+        Sorteia a prioridade de cada animal para as disputas do passo: um
+        número aleatório com o índice do animal nos bits baixos, para que
+        não haja empates.
+        """
+        n = len(sources)
+        high = self._integers(sources, stream, 0, 1 << 30) << 32
+        return high | np.arange(n, dtype=np.int64)
+
+    def _uniform(self, ids, stream):
+        """Um número em [0, 1) por animal (ids são as células deles)."""
+        if self._key is None:
+            return self.rng.random(len(ids))
+        return counter_uniform(self._key, ids, stream)
+
+    def _integers(self, ids, stream, low, high):
+        """Um inteiro em [low, high) por animal (ids são as células deles)."""
+        if self._key is None:
+            return self.rng.integers(low, high, len(ids), dtype=np.int64)
+        return counter_integers(self._key, ids, stream, low, high)
+
+    def _pick_winners(self, active, target, priority):
+        """
+        Resolve disputas pela mesma célula: vence o animal de menor valor
+        de prioridade entre os que escolheram cada célula.
+        :return: Os animais vencedores e suas células
+        """
+        size = len(self._owner)
+        if size <= target.max(initial=0):
+            self._owner = np.full(target.max() + 1, _NO_OWNER)
+        key = priority[active]
+        np.minimum.at(self._owner, target, key)
+        won = self._owner[target] == key
+        # Restaura apenas as posições usadas, para reaproveitar o array
+        self._owner[target] = _NO_OWNER
+        return active[won], target[won]
+
+    def _buffer(self, name, size, dtype):
+        """
+        Retorna os size primeiros elementos de um array de trabalho
+        reaproveitado entre chamadas (sem valores iniciais), para não
+        alocar arrays do tamanho da grade a cada passo.
+        """
+        buffer = self._buffers.get(name)
+        if buffer is None or len(buffer) < size:
+            buffer = np.empty(size, dtype=dtype)
+            self._buffers[name] = buffer
+        return buffer[:size]
+
+    def _split_claims(self, claims, got, births):
+        """
+        Separa as células reservadas: as primeiras de cada pai vão para os
+        filhotes, como em _give_birth.
+        :return: As células dos filhotes e os índices dos pais que ainda
+                 conseguiram uma célula para si (os demais morrem por
+                 superpopulação)
+        """
+        litter = np.minimum(births, got)
+        # Só as linhas dos pais com filhotes são percorridas
+        parents = np.flatnonzero(litter)
+        young = np.arange(claims.shape[1]) < litter[parents, None]
+        return claims[parents][young], np.flatnonzero(got > births)
+
+    def _place(self, next_field_state, code, cells, age, food):
+        """Escreve animais de uma espécie nas células dadas."""
+        next_field_state.species[cells] = code
+        next_field_state.age[cells] = age
+        next_field_state.food[cells] = food
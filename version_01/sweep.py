@@ -0,0 +1,110 @@
+# sweep.py
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from parameters import SimulationParameters
+from randomizer import Randomizer
+from simulator import Simulator
+from observers import StatsObserver, TelemetryObserver
+from telemetry import TelemetrySink, load_telemetry
+
+
+def expand_grid(grid):
+    """
+    Expande uma grade de parâmetros em todas as combinações possíveis.
+    :param grid: Um dicionário {"Classe.CONSTANTE": [valores]}
+    :return: Uma lista de SimulationParameters, uma por combinação
+    """
+    names = list(grid)
+    combinations = itertools.product(*(grid[name] for name in names))
+    return [SimulationParameters(dict(zip(names, values))) for values in combinations]
+
+
+def run_single(parameters, seed, depth, width, steps, vectorized=False, telemetry_path=None):
+    """
+    Executa uma simulação sem visualização com os parâmetros e a semente
+    dados e retorna a série temporal das populações.
+    :param telemetry_path: Se dado, a série é gravada neste CSV por um
+                           TelemetrySink, com memória constante, e o
+                           resultado traz só o caminho ('telemetry') no
+                           lugar das listas
+    """
+    previous_seed = Randomizer.SEED
+    parameters.apply()
+    try:
+        Randomizer.SEED = seed
+        Randomizer.reset()
+        if telemetry_path is None:
+            observer = StatsObserver()
+        else:
+            observer = TelemetryObserver(TelemetrySink(telemetry_path))
+        simulator = Simulator(depth, width, vectorized=vectorized,
+                              observers=[observer], headless=True)
+        simulator.simulate(steps)
+        simulator.close()
+    finally:
+        parameters.restore()
+        Randomizer.SEED = previous_seed
+        Randomizer.reset()
+
+    result = {
+        'parameters': dict(parameters.values),
+        'seed': seed
+    }
+    if telemetry_path is None:
+        result.update(observer.history)
+    else:
+        result['telemetry'] = telemetry_path
+    return result
+
+
+def load_run(result):
+    """
+    Retorna a série temporal de um resultado de run_single, lendo-a do
+    arquivo de telemetria se for o caso.
+    :return: Um dicionário com as listas 'steps', 'rabbits' e 'foxes'
+    """
+    if 'telemetry' not in result:
+        return {name: result[name] for name in ('steps', 'rabbits', 'foxes')}
+    rows = load_telemetry(result['telemetry'])
+    return {'steps': rows[:, 0].tolist(), 'rabbits': rows[:, 1].tolist(),
+            'foxes': rows[:, 2].tolist()}
+
+
+def run_sweep(grid, seeds, depth=None, width=None, steps=500,
+              vectorized=False, processes=None, telemetry_dir=None):
+    """
+    Executa uma simulação para cada combinação da grade de parâmetros e
+    cada semente, distribuindo as execuções em um pool de processos.
+    :param grid: Um dicionário {"Classe.CONSTANTE": [valores]}
+    :param seeds: As sementes a usar em cada combinação
+    :param processes: O número de processos; por padrão, um por núcleo
+    :param telemetry_dir: Se dado, a série de cada execução é gravada
+                          neste diretório (run-0000.csv, run-0001.csv...),
+                          em vez de voltar inteira na memória (ver
+                          run_single e load_run)
+    :return: Uma lista de resultados (ver run_single), na ordem da grade
+             e das sementes
+    """
+    if depth is None:
+        depth = Simulator.DEFAULT_DEPTH
+    if width is None:
+        width = Simulator.DEFAULT_WIDTH
+    if processes is None:
+        processes = os.cpu_count() or 1
+
+    tasks = [(parameters, seed, depth, width, steps, vectorized)
+             for parameters in expand_grid(grid)
+             for seed in seeds]
+    if telemetry_dir is not None:
+        os.makedirs(telemetry_dir, exist_ok=True)
+        tasks = [task + (os.path.join(telemetry_dir, f"run-{index:04d}.csv"),)
+                 for index, task in enumerate(tasks)]
+
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        return list(executor.map(_run_task, tasks))
+
+
+def _run_task(task):
+    """Executa uma tarefa do pool (desempacota os argumentos)."""
+    return run_single(*task)
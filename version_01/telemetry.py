@@ -0,0 +1,125 @@
+# telemetry.py
+import json
+import os
+import numpy as np
+
+
+class TelemetrySink:
+    """
+    Guarda a série temporal das populações com memória constante.
+
+    Cada passo vira uma linha (step, coelhos, raposas) escrita em um
+    buffer NumPy de tamanho fixo; quando o buffer enche, as linhas são
+    gravadas de uma vez, em lote, no fim de um arquivo CSV ou JSON Lines
+    (só acrescenta, nunca reescreve). Uma janela circular separada guarda
+    os últimos passos para quem precisa desenhar gráficos.
+    """
+
+    COLUMNS = ('step', 'rabbits', 'foxes')
+    FORMATS = ('csv', 'jsonl')
+
+    def __init__(self, path, buffer_size=4096, window=1000, format='csv'):
+        """
+        Cria um coletor que grava em path.
+        :param path: O arquivo; se já existir, as linhas são acrescentadas.
+                     Também pode ser um arquivo de texto já aberto (como
+                     sys.stdout), que não é fechado pelo coletor
+        :param buffer_size: Quantas linhas são acumuladas antes de gravar
+        :param window: Quantos passos recentes ficam disponíveis em memória
+        :param format: 'csv' (com cabeçalho) ou 'jsonl' (um objeto
+                       {"step": ..., "rabbits": ..., "foxes": ...} por linha)
+        """
+        if format not in self.FORMATS:
+            raise ValueError(f"Formato de telemetria desconhecido: {format}")
+        self.path = path
+        self.format = format
+        self._buffer = np.zeros((max(1, buffer_size), len(self.COLUMNS)), dtype=np.int64)
+        self._buffered = 0
+        self._window = np.zeros((max(1, window), len(self.COLUMNS)), dtype=np.int64)
+        self._window_next = 0   # Próxima posição da janela circular
+        self._window_full = False
+        self.rows_written = 0
+        self._file = None
+
+    def record(self, step, rabbits, foxes):
+        """Registra as contagens de um passo."""
+        row = (step, rabbits, foxes)
+        self._buffer[self._buffered] = row
+        self._buffered += 1
+
+        self._window[self._window_next] = row
+        self._window_next += 1
+        if self._window_next == len(self._window):
+            self._window_next = 0
+            self._window_full = True
+
+        if self._buffered == len(self._buffer):
+            self.flush()
+
+    def flush(self):
+        """Grava no arquivo as linhas ainda em memória."""
+        if self._buffered == 0:
+            return
+        if self._file is None:
+            self._open()
+        rows = self._buffer[:self._buffered]
+        if self.format == 'csv':
+            np.savetxt(self._file, rows, fmt='%d', delimiter=',')
+        else:
+            self._file.write(''.join(json.dumps(dict(zip(self.COLUMNS, row))) + '\n'
+                                     for row in rows.tolist()))
+        self._file.flush()
+        self.rows_written += self._buffered
+        self._buffered = 0
+
+    def get_window(self):
+        """
+        Retorna os passos recentes, do mais antigo ao mais novo, no mesmo
+        formato do histórico da SimulatorView.
+        :return: Um dicionário com as listas 'steps', 'rabbits' e 'foxes'
+        """
+        if self._window_full:
+            rows = np.concatenate((self._window[self._window_next:],
+                                   self._window[:self._window_next]))
+        else:
+            rows = self._window[:self._window_next]
+        return {
+            'steps': rows[:, 0].tolist(),
+            'rabbits': rows[:, 1].tolist(),
+            'foxes': rows[:, 2].tolist()
+        }
+
+    def close(self):
+        """
+        Grava as linhas pendentes e fecha o arquivo (um arquivo recebido já
+        aberto só é esvaziado).
+        """
+        self.flush()
+        if self._file is not None:
+            if self._file is self.path:
+                self._file.flush()
+            else:
+                self._file.close()
+            self._file = None
+
+    def _open(self):
+        """
+        Abre o arquivo para acréscimo, escrevendo o cabeçalho do CSV se o
+        arquivo for novo.
+        """
+        if hasattr(self.path, 'write'):
+            self._file = self.path
+            is_new = self._file.tell() == 0 if self._file.seekable() else True
+        else:
+            is_new = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+            self._file = open(self.path, 'a')
+        if is_new and self.format == 'csv':
+            self._file.write(','.join(self.COLUMNS) + '\n')
+
+
+def load_telemetry(path):
+    """
+    Lê um arquivo gravado por um TelemetrySink.
+    :return: Um array (n, 3) com as colunas step, rabbits e foxes
+    """
+    return np.loadtxt(path, dtype=np.int64, delimiter=',', skiprows=1, ndmin=2)
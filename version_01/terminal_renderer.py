@@ -0,0 +1,89 @@
+# terminal_renderer.py
+import shutil
+import sys
+import numpy as np
+from grid import downsample
+
+# Caractere e cor (código ANSI) de cada código da grade: vazio, coelho, raposa
+CELL_CHARS = ('\x1b[0m·', '\x1b[32mR', '\x1b[31mF')
+
+_RESET = '\x1b[0m'
+_CLEAR = '\x1b[2J'
+_HIDE_CURSOR = '\x1b[?25l'
+_SHOW_CURSOR = '\x1b[?25h'
+
+
+def _move(row, col):
+    """Sequência ANSI que leva o cursor à linha e coluna dadas (a partir de 0)."""
+    return f'\x1b[{row + 1};{col + 1}H'
+
+
+class TerminalRenderer:
+    """
+    Desenha a grade no terminal com sequências ANSI, para acompanhar uma
+    simulação por SSH. Só a primeira imagem é desenhada inteira; nas
+    seguintes, o cursor é levado a cada trecho de células que mudou desde a
+    imagem anterior e só esses caracteres são reescritos. A saída é
+    proporcional às mudanças, e não à área da grade.
+
+    Grades maiores que o terminal são reduzidas (ver downsample).
+    """
+
+    def __init__(self, stream=None, rows=None, cols=None):
+        """
+        Cria um desenhista.
+        :param stream: Onde escrever; por padrão, sys.stdout
+        :param rows: Linhas disponíveis para a grade; por padrão, as do
+                     terminal menos a linha de status
+        :param cols: Colunas disponíveis; por padrão, as do terminal
+        """
+        self.stream = stream if stream is not None else sys.stdout
+        size = shutil.get_terminal_size()
+        self.rows = rows if rows is not None else max(1, size.lines - 2)
+        self.cols = cols if cols is not None else max(1, size.columns)
+        self._previous = None
+
+    def render(self, grid, step, rabbit_count, fox_count):
+        """
+        Desenha uma imagem da grade, com uma linha de status acima dela.
+        :param grid: Um array 2D com os códigos 0 = vazio, 1 = coelho e
+                     2 = raposa
+        """
+        frame = downsample(np.asarray(grid), self.rows, self.cols)
+        output = [_move(0, 0), _RESET,
+                  f"Step {step:6d} | 🐰 {rabbit_count:8d} | 🦊 {fox_count:8d}\x1b[K"]
+
+        previous = self._previous
+        if previous is None or previous.shape != frame.shape:
+            output.insert(0, _CLEAR + _HIDE_CURSOR)
+            for row in range(frame.shape[0]):
+                output.append(_move(row + 1, 0))
+                output.append(''.join(CELL_CHARS[code] for code in frame[row].tolist()))
+        else:
+            changed_rows, changed_cols = np.nonzero(frame != previous)
+            self._append_runs(output, frame, changed_rows.tolist(), changed_cols.tolist())
+
+        output.append(_RESET)
+        self.stream.write(''.join(output))
+        self.stream.flush()
+        self._previous = frame.copy()
+
+    def close(self):
+        """Leva o cursor para baixo da grade e volta a mostrá-lo."""
+        if self._previous is not None:
+            self.stream.write(_move(self._previous.shape[0] + 1, 0) + _RESET + _SHOW_CURSOR + '\n')
+            self.stream.flush()
+            self._previous = None
+
+    def _append_runs(self, output, frame, rows, cols):
+        """
+        Acrescenta à saída as células mudadas, agrupadas em trechos
+        contíguos de uma linha: um movimento de cursor por trecho.
+        """
+        run_row = run_end = None
+        for row, col in zip(rows, cols):
+            if row != run_row or col != run_end:
+                output.append(_move(row + 1, col))
+                run_row = row
+            output.append(CELL_CHARS[frame[row, col]])
+            run_end = col + 1
@@ -0,0 +1,40 @@
+# test_checkpoint.py
+import pytest
+from simulator import Simulator
+from randomizer import Randomizer
+from checkpoint import save_checkpoint, load_checkpoint
+
+
+@pytest.fixture
+def counter_based():
+    """Liga os sorteios por contador durante o teste e restaura o Randomizer."""
+    seed = Randomizer.SEED
+    yield
+    Randomizer.SEED = seed
+    Randomizer.set_counter_based(False)
+    Randomizer.reset()
+
+
+def _simulator(seed, processes):
+    """Cria um simulador vetorizado, com sorteios por contador, com a semente dada."""
+    Randomizer.SEED = seed
+    Randomizer.set_counter_based(True)
+    Randomizer.reset()
+    return Simulator(60, 80, vectorized=True, processes=processes, headless=True)
+
+
+@pytest.mark.parametrize('processes', [None, 1])
+def test_resume_in_simulator_with_other_seed(tmp_path, counter_based, processes):
+    path = tmp_path / 'checkpoint.npz'
+    simulator = _simulator(1234, processes)
+    simulator.simulate(5)
+    save_checkpoint(simulator, path)
+    simulator.simulate(5)
+    expected = simulator.field.get_state_hash()
+    simulator.close()
+
+    resumed = _simulator(99, processes)
+    load_checkpoint(resumed, path)
+    resumed.simulate(5)
+    assert resumed.field.get_state_hash() == expected
+    resumed.close()
@@ -0,0 +1,75 @@
+# test_tiled_stepper.py
+import gc
+import hashlib
+import os
+import pytest
+from array_field import ArrayField
+from shared_array_field import SharedArrayField
+from simulator import Simulator
+from randomizer import Randomizer
+from tiled_stepper import TiledStepper
+
+
+class ReversedTiledStepper(TiledStepper):
+    """Um TiledStepper que calcula as faixas de cada cor na ordem inversa."""
+
+    def _color_bands(self, color, count):
+        return super()._color_bands(color, count)[::-1]
+
+
+def _run(depth, width, bands, processes=1, stepper_class=TiledStepper, steps=10):
+    """Executa alguns passos e retorna o hash do estado a cada passo."""
+    Randomizer.SEED = 1234
+    Randomizer.reset()
+    field_class = SharedArrayField if processes > 1 else ArrayField
+    simulator = Simulator(depth, width, field_class=field_class, headless=True)
+    simulator.stepper = stepper_class(Randomizer.SEED, processes, bands)
+    hashes = []
+    try:
+        for _ in range(steps):
+            simulator.simulate_one_step()
+            field = simulator.field
+            digest = hashlib.sha1()
+            for values in (field.species, field.age, field.food):
+                digest.update(values.tobytes())
+            hashes.append(digest.hexdigest())
+    finally:
+        simulator.close()
+    return hashes
+
+
+@pytest.mark.parametrize('depth, width', [(80, 120), (200, 200)])
+def test_band_order_does_not_change_result(depth, width):
+    # Mais faixas do que cabem: _band_rows limita a altura a MIN_BAND_ROWS
+    bands = depth // 2
+    assert _run(depth, width, bands) == _run(depth, width, bands, stepper_class=ReversedTiledStepper)
+
+
+def test_process_count_does_not_change_result():
+    expected = _run(80, 120, 8, steps=5)
+    for processes in (2, 3):
+        assert _run(80, 120, 8, processes, steps=5) == expected
+
+
+def test_default_bands_do_not_depend_on_processes():
+    expected = _run(200, 120, None, steps=5)
+    assert _run(200, 120, None, 2, steps=5) == expected
+
+
+def _shared_segments():
+    """Os nomes dos blocos de memória compartilhada existentes."""
+    return set(os.listdir('/dev/shm'))
+
+
+@pytest.mark.skipif(not os.path.isdir('/dev/shm'), reason="sem /dev/shm")
+@pytest.mark.parametrize('processes', [1, 2])
+def test_stepper_dropped_without_close_releases_memory(processes):
+    before = _shared_segments()
+    Randomizer.reset()
+    stepper = TiledStepper(1234, processes, 4)
+    stepper._get_dest_map(40 * 60)
+    if processes == 1:
+        assert _shared_segments() == before
+    del stepper
+    gc.collect()
+    assert _shared_segments() == before
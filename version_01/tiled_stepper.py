@@ -0,0 +1,235 @@
+# tiled_stepper.py
+import os
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+from array_field import ArrayField
+from shared_array_field import SharedArrayField, _unlink
+from step_kernels import VectorizedStepper, NO_RABBIT, PENDING
+from rabbit import Rabbit
+from fox import Fox
+
+# Altura mínima de uma faixa. Uma faixa lê e escreve até duas linhas fora
+# dela: uma raposa come um coelho da linha vizinha e apaga a célula para
+# onde ele foi (mais uma linha adiante). Duas faixas da mesma cor,
+# separadas por uma faixa de pelo menos 4 linhas, nunca tocam as mesmas
+# células, e podem agir em qualquer ordem
+MIN_BAND_ROWS = 4
+# Altura das faixas quando o número de faixas não é dado. Só depende da
+# grade: mudar o número de processos não muda as faixas (nem o resultado)
+BAND_ROWS = 32
+
+# As classes cujas constantes são repassadas aos processos
+_ANIMAL_CLASSES = (Rabbit, Fox)
+
+# Estado de cada processo do pool: o executor e os campos já conectados
+_worker_stepper = None
+_worker_fields = {}
+_worker_dest_maps = {}
+
+
+def _animal_constants():
+    """Retorna as constantes de Rabbit e Fox, para aplicar nos processos."""
+    return {animal_class.__name__: {name: getattr(animal_class, name)
+                                    for name in vars(animal_class) if name.isupper()}
+            for animal_class in _ANIMAL_CLASSES}
+
+
+def _attach_field(names, depth, width):
+    """Conecta-se (uma vez por processo) a um SharedArrayField."""
+    field = _worker_fields.get(names)
+    if field is None:
+        field = SharedArrayField(depth, width, names)
+        _worker_fields[names] = field
+    return field
+
+
+def _attach_dest_map(name, size):
+    """Conecta-se (uma vez por processo) ao mapa de destinos dos coelhos."""
+    entry = _worker_dest_maps.get(name)
+    if entry is None:
+        block = shared_memory.SharedMemory(name=name)
+        entry = (block, np.ndarray(size, dtype=np.int64, buffer=block.buf))
+        _worker_dest_maps[name] = entry
+    return entry[1]
+
+
+def _configure_band(stepper, seed, band, keying):
+    """
+    Prepara o executor de uma faixa: gerador próprio da faixa e, com
+    sorteios por contador, a mesma chave de passo do executor principal.
+    :param keying: A tupla (counter_based, semente, número do passo)
+    """
+    counter_based, stepper_seed, step_count = keying
+    stepper.rng = np.random.default_rng([seed, band])
+    stepper.counter_based = counter_based
+    stepper.seed = stepper_seed
+    stepper.start_step(step_count)
+
+
+def _step_band(task):
+    """
+    Executa, em um processo do pool, o passo de uma faixa de linhas.
+    :param task: A tupla montada por TiledStepper._tasks
+    """
+    global _worker_stepper
+    (field_names, next_names, dest_name, depth, width,
+     first_row, last_row, seed, band, keying, constants) = task
+
+    for animal_class in _ANIMAL_CLASSES:
+        for name, value in constants[animal_class.__name__].items():
+            setattr(animal_class, name, value)
+
+    if _worker_stepper is None:
+        _worker_stepper = VectorizedStepper(0)
+    field = _attach_field(field_names, depth, width)
+    next_field_state = _attach_field(next_names, depth, width)
+    dest_map = _attach_dest_map(dest_name, depth * width)
+
+    _configure_band(_worker_stepper, seed, band, keying)
+    _worker_stepper.step_region(field, next_field_state,
+                                first_row * width, last_row * width, dest_map)
+
+
+class TiledStepper(VectorizedStepper):
+    """
+    Um VectorizedStepper que divide o campo em faixas horizontais e as
+    calcula em paralelo, em um pool de processos, sobre campos em memória
+    compartilhada (SharedArrayField).
+
+    As faixas são coloridas alternadamente. Primeiro todas as faixas pares
+    agem ao mesmo tempo, depois todas as ímpares; como uma faixa só alcança
+    duas linhas fora dela (ver MIN_BAND_ROWS), duas faixas da mesma cor
+    nunca disputam células. Regra na fronteira entre faixas: a faixa que age primeiro
+    vence. Seus animais podem ocupar células da faixa vizinha e suas
+    raposas podem comer coelhos da faixa vizinha que ainda não agiram
+    (esses coelhos são retirados do estado atual e não agem mais).
+
+    Cada faixa usa um gerador aleatório próprio, derivado da semente do
+    passo e do número da faixa: com a mesma semente e o mesmo número de
+    faixas, o resultado é sempre o mesmo, qualquer que seja o número de
+    processos. Com sorteios por contador (counter_based), os sorteios de
+    cada animal também deixam de depender do número de faixas.
+    """
+
+    def __init__(self, seed=None, processes=None, bands=None, counter_based=None):
+        """
+        Cria o executor.
+        :param seed: A semente; por padrão, Randomizer.SEED
+        :param counter_based: Se os sorteios são por contador; por padrão,
+                              Randomizer.COUNTER_BASED
+        :param processes: O número de processos; por padrão, um por núcleo.
+                          Com 1, as faixas são calculadas neste processo
+        :param bands: O número de faixas; por padrão, uma a cada BAND_ROWS
+                      linhas, qualquer que seja o número de processos
+        """
+        super().__init__(seed, counter_based)
+        if processes is None:
+            processes = os.cpu_count() or 1
+        self.processes = max(1, processes)
+        self.bands = bands
+        self._pool = None
+        self._dest_map = None
+        self._dest_block = None
+        self._dest_finalizer = None
+        # Executor das faixas quando elas são calculadas neste processo
+        self._band_stepper = VectorizedStepper(0)
+
+    def step(self, field, next_field_state):
+        """
+        Calcula em next_field_state o estado seguinte de field, faixa por
+        faixa. Os coelhos comidos antes de agir são retirados de field.
+        """
+        self.start_step(self.step_count + 1)
+        depth, width = field.get_depth(), field.get_width()
+        rows = self._band_rows(depth)
+        dest_map = self._get_dest_map(depth * width)
+        dest_map.fill(NO_RABBIT)
+        dest_map[field.species == ArrayField.RABBIT] = PENDING
+
+        seed = int(self.rng.integers(0, np.iinfo(np.int64).max))
+        keying = (self.counter_based, self.seed, self.step_count)
+        if self.processes == 1:
+            for color in (0, 1):
+                for band in self._color_bands(color, len(rows)):
+                    first_row, last_row = rows[band]
+                    _configure_band(self._band_stepper, seed, band, keying)
+                    self._band_stepper.step_region(field, next_field_state,
+                                                   first_row * width, last_row * width, dest_map)
+        else:
+            tasks = self._tasks(field, next_field_state, rows, seed, keying)
+            for color in (0, 1):
+                # Espera todas as faixas de uma cor antes de começar a outra
+                bands = self._color_bands(color, len(rows))
+                list(self._get_pool().map(_step_band, [tasks[band] for band in bands]))
+
+        next_field_state.refresh_stats()
+
+    def close(self):
+        """Encerra o pool de processos e libera o mapa de destinos."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        self._release_dest_map()
+
+    def _release_dest_map(self):
+        """Libera o mapa de destinos e o seu bloco de memória compartilhada."""
+        self._dest_map = None
+        if self._dest_block is not None:
+            self._dest_block.close()
+            self._dest_finalizer()
+            self._dest_block = None
+            self._dest_finalizer = None
+
+    def _color_bands(self, color, count):
+        """
+        Retorna as faixas de uma cor (0 para as pares, 1 para as ímpares).
+        Como elas não tocam as mesmas células, a ordem não muda o resultado.
+        """
+        return list(range(color, count, 2))
+
+    def _band_rows(self, depth):
+        """
+        Divide as linhas em faixas de altura quase igual, com pelo menos
+        MIN_BAND_ROWS linhas cada.
+        :return: Uma lista de (primeira linha, linha após a última)
+        """
+        bands = self.bands if self.bands is not None else depth // BAND_ROWS
+        bands = max(1, min(bands, depth // MIN_BAND_ROWS))
+        edges = np.linspace(0, depth, bands + 1).astype(int).tolist()
+        return list(zip(edges[:-1], edges[1:]))
+
+    def _tasks(self, field, next_field_state, rows, seed, keying):
+        """Monta a descrição de cada faixa enviada aos processos."""
+        if not (isinstance(field, SharedArrayField) and
+                isinstance(next_field_state, SharedArrayField)):
+            raise TypeError("O TiledStepper com vários processos exige SharedArrayField")
+        constants = _animal_constants()
+        return [(field.get_shared_names(), next_field_state.get_shared_names(),
+                 self._dest_block.name, field.get_depth(), field.get_width(),
+                 first_row, last_row, seed, band, keying, constants)
+                for band, (first_row, last_row) in enumerate(rows)]
+
+    def _get_dest_map(self, size):
+        """
+        Retorna o mapa de destinos dos coelhos: um array comum com um só
+        processo, ou em memória compartilhada, para o pool. O bloco é
+        apagado por close ou, se close não for chamado, quando o executor
+        deixa de ser usado.
+        """
+        if self._dest_map is None or len(self._dest_map) != size:
+            self._release_dest_map()
+            if self.processes == 1:
+                self._dest_map = np.empty(size, dtype=np.int64)
+            else:
+                self._dest_block = shared_memory.SharedMemory(create=True, size=size * 8)
+                self._dest_finalizer = weakref.finalize(self, _unlink, [self._dest_block])
+                self._dest_map = np.ndarray(size, dtype=np.int64, buffer=self._dest_block.buf)
+        return self._dest_map
+
+    def _get_pool(self):
+        """Cria o pool de processos na primeira vez em que é necessário."""
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.processes)
+        return self._pool
@@ -0,0 +1,79 @@
+# zobrist.py
+import numpy as np
+from counter_random import mix64, mix64_array
+
+# Separa as chaves do hash dos fluxos do gerador por contador
+_SALT = 0x5A0B12157A7E4A5E
+
+
+class Zobrist:
+    """
+    Hash de Zobrist do conteúdo de um campo: o XOR de uma chave de 64 bits
+    por animal, que depende da célula e do estado do animal. Colocar ou
+    retirar um animal muda o hash com um único XOR, e dois campos com o
+    mesmo conteúdo têm o mesmo hash (qualquer que seja a implementação do
+    campo ou a ordem em que os animais foram colocados).
+
+    As chaves são calculadas por hash (SplitMix64), sem tabela: servem para
+    grades de qualquer tamanho.
+    """
+
+    # Quantos passos de idade e níveis de comida formam cada faixa que
+    # entra no hash; 0 deixa a idade (ou a comida) de fora, e o hash passa
+    # a considerar só a espécie em cada célula
+    AGE_BUCKET = 0
+    FOOD_BUCKET = 0
+
+    @staticmethod
+    def state_code(species, age, food):
+        """
+        Codifica o estado de um animal (a espécie e, se configuradas, as
+        faixas de idade e de comida) em um inteiro.
+        :param species: O código da espécie (Field.RABBIT ou Field.FOX)
+        """
+        code = species
+        if Zobrist.AGE_BUCKET:
+            code |= (age // Zobrist.AGE_BUCKET + 1) << 2
+        if Zobrist.FOOD_BUCKET:
+            code |= (food // Zobrist.FOOD_BUCKET + 1) << 18
+        return code
+
+    # Chaves já calculadas, por (célula << 22) | código; esvaziado ao passar
+    # de CACHE_LIMIT chaves
+    CACHE_LIMIT = 1 << 20
+    _keys = {}
+
+    @staticmethod
+    def key(cell, code):
+        """Retorna a chave de um animal com o código dado na célula dada."""
+        packed = (cell << 22) | code
+        key = Zobrist._keys.get(packed)
+        if key is None:
+            if len(Zobrist._keys) >= Zobrist.CACHE_LIMIT:
+                Zobrist._keys.clear()
+            key = mix64(packed ^ _SALT)
+            Zobrist._keys[packed] = key
+        return key
+
+    @staticmethod
+    def state_codes(species, age, food):
+        """state_code aplicada a arrays (um animal por posição)."""
+        codes = species.astype(np.uint64)
+        if Zobrist.AGE_BUCKET:
+            buckets = age.astype(np.uint64) // np.uint64(Zobrist.AGE_BUCKET) + np.uint64(1)
+            codes |= buckets << np.uint64(2)
+        if Zobrist.FOOD_BUCKET:
+            buckets = food.astype(np.uint64) // np.uint64(Zobrist.FOOD_BUCKET) + np.uint64(1)
+            codes |= buckets << np.uint64(18)
+        return codes
+
+    @staticmethod
+    def hash_cells(cells, codes):
+        """
+        Retorna o hash de um campo inteiro a partir das células ocupadas e
+        dos códigos dos animais; é o mesmo valor que o Field mantém
+        incrementalmente.
+        """
+        cells = np.asarray(cells).astype(np.uint64)
+        keys = mix64_array(((cells << np.uint64(22)) | codes) ^ np.uint64(_SALT))
+        return int(np.bitwise_xor.reduce(keys)) if len(keys) else 0